@@ -1,9 +1,19 @@
 """Pytest configuration and shared fixtures for all tests."""
 
+import copy
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
 import pytest
 import pandas as pd
 from pathlib import Path
 from typing import Dict, List
+from urllib.parse import urlsplit
+from urllib.request import urlopen
 import tempfile
 import shutil
 
@@ -16,128 +26,132 @@ def test_data_dir():
     shutil.rmtree(temp_dir)
 
 
-@pytest.fixture
-def sample_trial_json():
-    """Sample clinical trial JSON data."""
-    return {
-        "protocolSection": {
-            "identificationModule": {
-                "nctId": "NCT12345678",
-                "briefTitle": "Test Phase 2 Trial in NSCLC",
-                "officialTitle": "A Phase 2 Study of Novel Agent in Advanced NSCLC"
-            },
-            "statusModule": {
-                "overallStatus": "RECRUITING",
-                "startDateStruct": {"date": "2024-01-01"},
-                "completionDateStruct": {"date": "2025-12-31"},
-                "lastUpdatePostDateStruct": {"date": "2024-03-01"}
-            },
-            "sponsorCollaboratorsModule": {
-                "leadSponsor": {
-                    "name": "Test Pharmaceutical Company"
-                },
-                "collaborators": []
-            },
-            "descriptionModule": {
-                "briefSummary": "This is a phase 2 trial testing a novel agent in patients with advanced NSCLC.",
-                "detailedDescription": "Detailed description of the trial methodology and objectives."
+# Raw API record of a single trial, as written by the fetch step
+SAMPLE_TRIAL_JSON = {
+    "protocolSection": {
+        "identificationModule": {
+            "nctId": "NCT12345678",
+            "briefTitle": "Test Phase 2 Trial in NSCLC",
+            "officialTitle": "A Phase 2 Study of Novel Agent in Advanced NSCLC"
+        },
+        "statusModule": {
+            "overallStatus": "RECRUITING",
+            "startDateStruct": {"date": "2024-01-01"},
+            "completionDateStruct": {"date": "2025-12-31"},
+            "lastUpdatePostDateStruct": {"date": "2024-03-01"}
+        },
+        "sponsorCollaboratorsModule": {
+            "leadSponsor": {
+                "name": "Test Pharmaceutical Company"
             },
-            "designModule": {
-                "phases": ["PHASE2"],
-                "studyType": "INTERVENTIONAL",
-                "designInfo": {
-                    "allocation": "RANDOMIZED",
-                    "maskingInfo": {"masking": "DOUBLE"}
+            "collaborators": []
+        },
+        "descriptionModule": {
+            "briefSummary": "This is a phase 2 trial testing a novel agent in patients with advanced NSCLC.",
+            "detailedDescription": "Detailed description of the trial methodology and objectives."
+        },
+        "designModule": {
+            "phases": ["PHASE2"],
+            "studyType": "INTERVENTIONAL",
+            "designInfo": {
+                "allocation": "RANDOMIZED",
+                "maskingInfo": {"masking": "DOUBLE"}
+            }
+        },
+        "armsInterventionsModule": {
+            "interventions": [
+                {
+                    "type": "DRUG",
+                    "name": "Novel Agent X",
+                    "description": "Experimental drug"
                 }
-            },
-            "armsInterventionsModule": {
-                "interventions": [
-                    {
-                        "type": "DRUG",
-                        "name": "Novel Agent X",
-                        "description": "Experimental drug"
-                    }
-                ]
-            },
-            "eligibilityModule": {
-                "eligibilityCriteria": """
-                Inclusion Criteria:
-                - Age ≥18 years
-                - Histologically confirmed NSCLC
-                - EGFR exon 19 deletion or L858R mutation
-                - PD-L1 expression ≥50%
-                - ECOG performance status 0-1
-                - Treatment-naive advanced disease
-                - Adequate organ function
-
-                Exclusion Criteria:
-                - Untreated brain metastases
-                - Prior EGFR TKI therapy
-                - Active autoimmune disease
-                - HIV, HBV, or HCV infection
-                - Pregnant or nursing women
-                """,
-                "sex": "ALL",
-                "minimumAge": "18 Years",
-                "maximumAge": "N/A",
-                "healthyVolunteers": False
-            },
-            "contactsLocationsModule": {
-                "locations": [
-                    {
-                        "facility": "Memorial Cancer Center",
-                        "city": "Boston",
-                        "state": "Massachusetts",
-                        "zip": "02115",
-                        "country": "United States",
-                        "status": "RECRUITING",
-                        "geoPoint": {
-                            "lat": 42.3601,
-                            "lon": -71.0589
-                        }
-                    },
-                    {
-                        "facility": "University Medical Center",
-                        "city": "Los Angeles",
-                        "state": "California",
-                        "zip": "90033",
-                        "country": "United States",
-                        "status": "RECRUITING",
-                        "geoPoint": {
-                            "lat": 34.0522,
-                            "lon": -118.2437
-                        }
-                    }
-                ],
-                "centralContacts": [
-                    {
-                        "name": "Study Coordinator",
-                        "phone": "555-1234",
-                        "email": "coordinator@example.com"
-                    }
-                ]
-            },
-            "outcomesModule": {
-                "primaryOutcomes": [
-                    {
-                        "measure": "Objective Response Rate",
-                        "description": "Proportion of patients achieving CR or PR",
-                        "timeFrame": "24 months"
+            ]
+        },
+        "eligibilityModule": {
+            "eligibilityCriteria": """
+            Inclusion Criteria:
+            - Age ≥18 years
+            - Histologically confirmed NSCLC
+            - EGFR exon 19 deletion or L858R mutation
+            - PD-L1 expression ≥50%
+            - ECOG performance status 0-1
+            - Treatment-naive advanced disease
+            - Adequate organ function
+
+            Exclusion Criteria:
+            - Untreated brain metastases
+            - Prior EGFR TKI therapy
+            - Active autoimmune disease
+            - HIV, HBV, or HCV infection
+            - Pregnant or nursing women
+            """,
+            "sex": "ALL",
+            "minimumAge": "18 Years",
+            "maximumAge": "N/A",
+            "healthyVolunteers": False
+        },
+        "contactsLocationsModule": {
+            "locations": [
+                {
+                    "facility": "Memorial Cancer Center",
+                    "city": "Boston",
+                    "state": "Massachusetts",
+                    "zip": "02115",
+                    "country": "United States",
+                    "status": "RECRUITING",
+                    "geoPoint": {
+                        "lat": 42.3601,
+                        "lon": -71.0589
                     }
-                ],
-                "secondaryOutcomes": [
-                    {
-                        "measure": "Progression-Free Survival",
-                        "timeFrame": "36 months"
-                    },
-                    {
-                        "measure": "Overall Survival",
-                        "timeFrame": "60 months"
+                },
+                {
+                    "facility": "University Medical Center",
+                    "city": "Los Angeles",
+                    "state": "California",
+                    "zip": "90033",
+                    "country": "United States",
+                    "status": "RECRUITING",
+                    "geoPoint": {
+                        "lat": 34.0522,
+                        "lon": -118.2437
                     }
-                ]
-            }
+                }
+            ],
+            "centralContacts": [
+                {
+                    "name": "Study Coordinator",
+                    "phone": "555-1234",
+                    "email": "coordinator@example.com"
+                }
+            ]
+        },
+        "outcomesModule": {
+            "primaryOutcomes": [
+                {
+                    "measure": "Objective Response Rate",
+                    "description": "Proportion of patients achieving CR or PR",
+                    "timeFrame": "24 months"
+                }
+            ],
+            "secondaryOutcomes": [
+                {
+                    "measure": "Progression-Free Survival",
+                    "timeFrame": "36 months"
+                },
+                {
+                    "measure": "Overall Survival",
+                    "timeFrame": "60 months"
+                }
+            ]
         }
     }
+}
+
+
+@pytest.fixture
+def sample_trial_json():
+    """Sample clinical trial JSON data."""
+    return copy.deepcopy(SAMPLE_TRIAL_JSON)
 
 
 @pytest.fixture
@@ -171,7 +185,7 @@ def sample_trials_df():
             "start_date": "2023-06-01",
             "sponsor": "Biotech Inc"
         }
-    ])
+    ]).astype({"status": "category", "phase": "category"})
 
 
 @pytest.fixture
@@ -369,7 +383,324 @@ def mock_api_response():
     }
 
 
+# Playwright UI fixtures
+#
+# Under pytest-xdist (``-n auto``) each worker is its own process with its
+# own session: it launches its own browser (with browser_type_launch_args),
+# its own shared browser_context and, with --start-streamlit, its own app on
+# _worker_port(). Run them with ``--dist loadfile`` so all tests of a file
+# run on one worker and share that file's module-scoped page.
+STREAMLIT_HOST = "localhost"
+STREAMLIT_PORT = 8501
+STREAMLIT_START_TIMEOUT = 30
+APP_PATH = Path(__file__).parent.parent / "trials" / "app.py"
+
+
+def _streamlit_up(host: str = STREAMLIT_HOST, port: int = STREAMLIT_PORT) -> bool:
+    """Check whether the Streamlit app is ready to serve pages.
+
+    Asks Streamlit's health endpoint rather than just opening a connection:
+    the port starts accepting connections before the server has finished
+    starting, and something other than Streamlit may be listening on it.
+    """
+    try:
+        with urlopen(f"http://{host}:{port}/_stcore/health", timeout=0.5) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def _worker_port() -> int:
+    """Streamlit port for this test worker.
+
+    Each pytest-xdist worker gets its own app instance: gw0 (or a run
+    without xdist) uses STREAMLIT_PORT, gw1 the next port, and so on.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    return STREAMLIT_PORT + int(worker.removeprefix("gw"))
+
+
+@pytest.fixture(scope="session")
+def base_url(pytestconfig):
+    """URL of the Streamlit app this worker's UI tests run against.
+
+    Workers share the app on STREAMLIT_PORT unless --start-streamlit is
+    given, in which case each one gets its own instance.
+    """
+    if pytestconfig.getoption("--base-url"):
+        return pytestconfig.getoption("--base-url")
+    port = _worker_port() if pytestconfig.getoption("--start-streamlit") else STREAMLIT_PORT
+    return f"http://{STREAMLIT_HOST}:{port}"
+
+
+@pytest.fixture(scope="session")
+def seed_data(tmp_path_factory):
+    """Build a small processed dataset for a Streamlit app started by the tests.
+
+    Runs the normal pipeline steps over SAMPLE_TRIAL_JSON, so the app opens
+    with data loaded instead of the "No data loaded" prompt.
+
+    Returns:
+        Tuple of (raw data dir, clean data dir)
+    """
+    from trials.clinical_data import create_clinical_dataframes
+    from trials.eligibility import parse_all_eligibility
+    from trials.features import build_features
+    from trials.normalize import normalize_all
+    from trials.risk import score_all_trials
+
+    raw_dir = tmp_path_factory.mktemp("raw")
+    clean_dir = tmp_path_factory.mktemp("clean")
+    raw_file = raw_dir / "trials.jsonl"
+    raw_file.write_text(json.dumps(SAMPLE_TRIAL_JSON) + "\n")
+
+    # The pipeline steps print progress reports meant for the CLI
+    with redirect_stdout(io.StringIO()):
+        normalize_all(raw_dir, clean_dir / "trials.parquet")
+        parse_all_eligibility(clean_dir / "trials.parquet", clean_dir / "eligibility.parquet")
+        build_features(clean_dir / "trials.parquet", clean_dir / "features.parquet")
+        score_all_trials(clean_dir / "features.parquet", clean_dir / "risks.parquet")
+        interventions, locations, clinical_details = create_clinical_dataframes(raw_file)
+    interventions.to_parquet(clean_dir / "interventions.parquet", index=False)
+    locations.to_parquet(clean_dir / "locations.parquet", index=False)
+    clinical_details.to_parquet(clean_dir / "clinical_details.parquet", index=False)
+
+    return raw_dir, clean_dir
+
+
+@pytest.fixture(scope="session")
+def streamlit_server(request, pytestconfig, base_url):
+    """Make sure the Streamlit app is reachable, or skip the UI tests.
+
+    With --start-streamlit an app instance is launched for this worker if
+    none is running, reading its data from seed_data. Otherwise the UI
+    tests are skipped after a single connection attempt instead of each
+    one timing out on page load.
+    """
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    if _streamlit_up(host, port):
+        yield
+        return
+    if not pytestconfig.getoption("--start-streamlit"):
+        pytest.skip(f"Streamlit app not running on {host}:{port}")
+
+    raw_dir, clean_dir = request.getfixturevalue("seed_data")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP_PATH),
+         "--server.port", str(port), "--server.headless", "true",
+         "--browser.gatherUsageStats", "false"],
+        env={
+            **os.environ,
+            "PYTHONPATH": str(APP_PATH.parent.parent),
+            "RAW_DATA_DIR": str(raw_dir),
+            "CLEAN_DATA_DIR": str(clean_dir)
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + STREAMLIT_START_TIMEOUT
+    while not _streamlit_up(host, port):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.terminate()
+            pytest.skip(f"Streamlit app failed to start on {host}:{port}")
+        time.sleep(0.2)
+
+    yield
+    process.terminate()
+    process.wait(timeout=10)
+
+
+# Resource types none of the UI tests look at, so they are never downloaded
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Telemetry and font hosts the app may call out to; tests never need them
+BLOCKED_HOSTS = frozenset({
+    "www.google-analytics.com",
+    "stats.g.doubleclick.net",
+    "www.googletagmanager.com",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+    "webhooks.fivetran.com",
+})
+
+
+def _asset_blocker(app_host: str):
+    """Build a route handler that only lets through what the app needs.
+
+    Images, fonts, media and telemetry are aborted, as are stylesheets from
+    any host but the app's own; the app's own CSS, scripts and XHR pass.
+
+    Args:
+        app_host: Host name the app under test is served from
+
+    Returns:
+        Handler for BrowserContext.route
+    """
+    def _handle(route):
+        request = route.request
+        host = urlsplit(request.url).hostname
+        if (
+            request.resource_type in BLOCKED_RESOURCE_TYPES
+            or host in BLOCKED_HOSTS
+            or (request.resource_type == "stylesheet" and host != app_host)
+        ):
+            route.abort()
+        else:
+            route.continue_()
+
+    return _handle
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args, browser_name):
+    """Chromium flags that cut rendering work in headless test runs."""
+    if browser_name != "chromium":
+        return browser_type_launch_args
+    return {
+        **browser_type_launch_args,
+        "args": ["--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage"]
+    }
+
+
+def _storage_state_key(base_url: str) -> str:
+    """pytest cache key for the storage state saved for an app URL."""
+    return "ui/storage_state/" + urlsplit(base_url).netloc.replace(":", "_")
+
+
+@pytest.fixture(scope="session")
+def browser_context(request, streamlit_server, browser_type, browser_type_launch_args,
+                    browser_context_args, pytestconfig, base_url):
+    """Browser context shared by every UI test in this worker.
+
+    The browser is launched once per session, and every test opens its page
+    in this one context instead of launching a context of its own; run with
+    ``pytest -n auto --dist loadfile tests/test_ui_*.py`` to spread test
+    files across workers.
+    The context starts from the storage state an earlier run saved for the
+    same app, when there is one.
+
+    With --browser-profile the context is a persistent one, so the browser's
+    disk cache of the Streamlit frontend survives between runs. Each xdist
+    worker gets its own profile, since a profile can only be open once.
+    """
+    # Service workers would serve requests past the route handler below
+    context_args = {**browser_context_args, "service_workers": "block"}
+    profile = pytestconfig.getoption("--browser-profile")
+    if profile:
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+        context = browser_type.launch_persistent_context(
+            Path(profile) / worker, **browser_type_launch_args, **context_args
+        )
+    else:
+        cache = getattr(pytestconfig, "cache", None)
+        saved_state = cache.get(_storage_state_key(base_url), None) if cache else None
+        browser = request.getfixturevalue("browser")
+        context = browser.new_context(**context_args, storage_state=saved_state)
+    context.route("**/*", _asset_blocker(urlsplit(base_url).hostname))
+    yield context
+    context.close()
+
+
+@pytest.fixture(scope="session")
+def warm_state(browser_context, pytestconfig, base_url) -> Dict:
+    """Storage state of the shared context after it has loaded the app once.
+
+    Captured once per session so later pages start from the cookies and
+    local storage of a warmed-up app, and saved to the pytest cache so the
+    next run's context starts from it too.
+    """
+    from tests.ui_helpers import open_app
+
+    page = browser_context.new_page()
+    open_app(page)
+    state = browser_context.storage_state()
+    page.close()
+
+    cache = getattr(pytestconfig, "cache", None)
+    if cache is not None:
+        cache.set(_storage_state_key(base_url), state)
+    return state
+
+
+def _reset_cookies(context, warm_state: Dict):
+    """Put the context's cookies back to the warmed-up snapshot."""
+    context.clear_cookies()
+    if warm_state["cookies"]:
+        context.add_cookies(warm_state["cookies"])
+
+
+@pytest.fixture
+def page(browser_context, warm_state):
+    """Fresh page in the shared browser context.
+
+    Cookies are reset to the warm_state snapshot first, so each test
+    starts a new Streamlit session without anything earlier tests set.
+    """
+    _reset_cookies(browser_context, warm_state)
+    page = browser_context.new_page()
+    yield page
+    page.close()
+
+
+@pytest.fixture(scope="module")
+def module_page(browser_context, warm_state):
+    """Page shared by every test in a module, for read-mostly tab fixtures."""
+    _reset_cookies(browser_context, warm_state)
+    page = browser_context.new_page()
+    yield page
+    page.close()
+
+
+@pytest.fixture
+def streamlit_app(page):
+    """Fresh page with the app loaded, for tests that start from the main view."""
+    from tests.ui_helpers import open_app
+
+    open_app(page)
+    return page
+
+
+@pytest.fixture(scope="module")
+def open_tab(module_page):
+    """Factory that loads the app on the module's page and switches to a tab.
+
+    Returns:
+        Function taking a tab name from tests.ui_helpers.TABS and returning
+        the page showing that tab
+    """
+    from tests.ui_helpers import click_tab, open_app
+
+    def _open(name: str):
+        open_app(module_page)
+        click_tab(module_page, name)
+        return module_page
+
+    return _open
+
 # Pytest configuration
+def pytest_addoption(parser):
+    """Add command line options for the UI tests."""
+    parser.addoption(
+        "--run-ui",
+        action="store_true",
+        default=False,
+        help="Run the Playwright UI tests, which are skipped by default"
+    )
+    parser.addoption(
+        "--start-streamlit",
+        action="store_true",
+        default=False,
+        help="Start a Streamlit app per test worker for the UI tests if none is running"
+    )
+    parser.addoption(
+        "--browser-profile",
+        default=None,
+        help="Keep the UI tests' browser profile, including its HTTP cache, in this "
+             "directory between runs"
+    )
+
+
 def pytest_configure(config):
     """Pytest configuration hook."""
     config.addinivalue_line(
@@ -384,6 +715,89 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "unit: marks tests as unit tests"
     )
+    config.addinivalue_line(
+        "markers", "requires_data: UI test that needs trial data loaded in the app"
+    )
+    config.addinivalue_line(
+        "markers", "mutates: UI test that changes page state shared with later tests"
+    )
+    config.addinivalue_line(
+        "markers", "xfail_browser(*names, reason): UI test known to fail on the named browsers"
+    )
+
+
+def _data_available(config) -> bool:
+    """Whether the app under test will have trial data loaded.
+
+    An app started by the tests reads the seeded dataset; an app that is
+    already running is assumed to share this checkout's data directory.
+    """
+    from trials.config import config as app_config
+
+    url = urlsplit(config.getoption("--base-url") or f"http://{STREAMLIT_HOST}:{STREAMLIT_PORT}")
+    if config.getoption("--start-streamlit") and not _streamlit_up(url.hostname, url.port or 80):
+        return True
+    return (app_config.CLEAN_DATA_DIR / "trials.parquet").exists()
+
+
+def _mark_browser(item):
+    """Group a UI test by file and browser, and apply its xfail_browser marks.
+
+    With several --browser options and ``--dist loadgroup``, each file and
+    browser pair then runs on its own xdist worker, so the browsers run side
+    by side instead of one after another.
+    """
+    callspec = getattr(item, "callspec", None)
+    browser = callspec.params.get("browser_name") if callspec else None
+    if browser is None:
+        return
+    item.add_marker(pytest.mark.xdist_group(f"{item.path.stem}-{browser}"))
+    for mark in item.iter_markers("xfail_browser"):
+        if browser in mark.args:
+            item.add_marker(pytest.mark.xfail(reason=mark.kwargs.get("reason", ""), strict=False))
+
+
+def pytest_ignore_collect(collection_path, config):
+    """Leave the UI test files out of directory runs without --run-ui.
+
+    Their tests would all be skipped anyway, so this saves importing
+    Playwright, and lets the unit tests run where it is not installed.
+    Files named on the command line are still collected and reported as
+    skipped.
+    """
+    if collection_path.match("test_ui_*.py") and not config.getoption("--run-ui"):
+        return True
+    return None
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests up front, before any of their fixtures run.
+
+    UI tests are skipped unless --run-ui is given, and requires_data tests
+    are skipped when the app has no data to show.
+    """
+    if not config.getoption("--run-ui"):
+        skip = pytest.mark.skip(reason="needs --run-ui")
+        for item in items:
+            if "ui" in item.keywords:
+                item.add_marker(skip)
+        return
+
+    for item in items:
+        _mark_browser(item)
+    # Within each file, run tests that leave the shared page changed after
+    # the read-only ones, so those all see the page as first loaded
+    module_order = {}
+    for item in items:
+        module_order.setdefault(item.module, len(module_order))
+    items.sort(key=lambda item: (module_order[item.module], bool(item.get_closest_marker("mutates"))))
+
+    marked = [item for item in items if item.get_closest_marker("requires_data")]
+    if not marked or _data_available(config):
+        return
+    skip = pytest.mark.skip(reason="no data")
+    for item in marked:
+        item.add_marker(skip)
 
 
 # Custom assertions
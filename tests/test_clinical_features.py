@@ -6,7 +6,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from trials.app import haversine_distance, geocode_location
+from trials.app import haversine_distance, geocode_location, required_biomarkers
 from trials.validators import (
     validate_age, validate_state, validate_cancer_type,
     validate_nct_id, validate_ecog, validate_prior_therapies,
@@ -193,24 +193,27 @@ class TestBiomarkerMatching:
     def test_biomarker_exclusion_mismatch(self):
         """Test that mismatched biomarkers cause exclusion."""
         # Patient has EGFR, trial requires HER2
-        patient_biomarkers = ["egfr"]
+        patient_biomarkers = frozenset({"egfr"})
         trial_biomarkers = {"her2_status": "Positive", "egfr_mutation": None}
 
-        # In real app, this would trigger exclusion
-        requires_her2 = trial_biomarkers.get("her2_status") == "Positive"
-        has_her2 = "her2" in patient_biomarkers
+        missing = required_biomarkers(trial_biomarkers) - patient_biomarkers
 
-        assert requires_her2 and not has_her2, "Should detect biomarker mismatch"
+        assert missing == {"her2"}, "Should detect biomarker mismatch"
 
     def test_biomarker_match(self):
         """Test matching biomarkers."""
-        patient_biomarkers = ["egfr"]
+        patient_biomarkers = frozenset({"egfr"})
         trial_biomarkers = {"egfr_mutation": True, "her2_status": None}
 
-        has_egfr = "egfr" in patient_biomarkers
-        requires_egfr = trial_biomarkers.get("egfr_mutation") == True
+        required = required_biomarkers(trial_biomarkers)
 
-        assert has_egfr and requires_egfr, "Should detect biomarker match"
+        assert required == {"egfr"}
+        assert not required - patient_biomarkers, "Should detect biomarker match"
+
+    def test_pdl1_cutoff_requires_pdl1(self):
+        """Test that a PD-L1 cutoff counts as a PD-L1 requirement."""
+        assert required_biomarkers({"pdl1_cutoff": ">=50%"}) == {"pdl1"}
+        assert required_biomarkers({}) == frozenset()
 
 
 if __name__ == "__main__":
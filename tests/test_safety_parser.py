@@ -55,6 +55,17 @@ class TestParseAdverseEvents:
         assert result["grade_3_4_events"] == []
         assert result["safety_monitoring"] == []
 
+    def test_repeated_calls_return_independent_results(self):
+        """Test that mutating a cached result doesn't affect later calls."""
+        text = "Common adverse events: nausea, fatigue, headache"
+        first = parse_adverse_events(text)
+        first["common_aes"].append("mutated")
+
+        second = parse_adverse_events(text)
+
+        assert "mutated" not in second["common_aes"]
+        assert first is not second
+
     def test_combined_texts(self):
         """Test parsing from both eligibility and description."""
         eligibility = "Common toxicities: fatigue, rash"
@@ -58,6 +58,35 @@ class TestSearchProfileManager:
         assert id2 == "PROF0002"
         assert id3 == "PROF0003"
 
+    def test_profile_id_not_reused_after_delete(self, tmp_path):
+        """Test deleting a profile does not recycle its ID."""
+        manager = SearchProfileManager(data_dir=str(tmp_path / "profiles"))
+
+        id1 = manager.save_profile("Profile 1", {"age": 65})
+        manager.save_profile("Profile 2", {"age": 70})
+        manager.delete_profile(id1)
+
+        id3 = manager.save_profile("Profile 3", {"age": 75})
+
+        assert id3 == "PROF0003"
+        # Counter resumes from the highest persisted ID
+        manager2 = SearchProfileManager(data_dir=str(tmp_path / "profiles"))
+        assert manager2.save_profile("Profile 4", {"age": 80}) == "PROF0004"
+
+    def test_malformed_profile_ids_skipped(self, tmp_path):
+        """Test hand-edited profile IDs don't stop the profiles from loading."""
+        data_dir = tmp_path / "profiles"
+        data_dir.mkdir()
+        (data_dir / "search_profiles.json").write_text(json.dumps([
+            {"profile_id": "PROF0002", "name": "Saved"},
+            {"profile_id": "my-profile", "name": "Edited"}
+        ]))
+
+        manager = SearchProfileManager(data_dir=str(data_dir))
+
+        assert len(manager.profiles) == 2
+        assert manager.save_profile("New", {"age": 65}) == "PROF0003"
+
     def test_load_profile(self, tmp_path):
         """Test loading a profile by ID."""
         manager = SearchProfileManager(data_dir=str(tmp_path / "profiles"))
@@ -157,6 +186,16 @@ class TestSearchProfileManager:
         loaded = manager2.load_profile(profile_id)
         assert loaded is not None
 
+    def test_profiles_file_is_compact(self, tmp_path):
+        """Test profiles are written as compact JSON."""
+        manager = SearchProfileManager(data_dir=str(tmp_path / "profiles"))
+        manager.save_profile("Test", {"age": 65})
+
+        content = manager.profiles_file.read_text()
+
+        assert "\n" not in content
+        assert json.loads(content)[0]["name"] == "Test"
+
     def test_save_without_description(self, tmp_path):
         """Test saving profile without description."""
         manager = SearchProfileManager(data_dir=str(tmp_path / "profiles"))
@@ -212,6 +251,20 @@ class TestSearchHistoryManager:
         assert manager.history[0]["search_id"] == "SEARCH00002"
         assert manager.history[1]["search_id"] == "SEARCH00001"
 
+    def test_malformed_search_ids_skipped(self, tmp_path):
+        """Test hand-edited search IDs don't stop the history from loading."""
+        data_dir = tmp_path / "profiles"
+        data_dir.mkdir()
+        (data_dir / "search_history.json").write_text(json.dumps([
+            {"search_id": "SEARCH-old", "criteria": {}},
+            {"search_id": "SEARCH00004", "criteria": {}}
+        ]))
+
+        manager = SearchHistoryManager(data_dir=str(data_dir))
+        manager.add_search({"age": 65}, 10)
+
+        assert manager.history[0]["search_id"] == "SEARCH00005"
+
     def test_searches_ordered_newest_first(self, tmp_path):
         """Test searches are ordered newest first."""
         manager = SearchHistoryManager(data_dir=str(tmp_path / "profiles"))
@@ -235,6 +288,7 @@ class TestSearchHistoryManager:
 
         # Should keep only last 50
         assert len(manager.history) == 50
+        assert manager.history[0]["search_id"] == "SEARCH00060"
 
     def test_get_recent_searches(self, tmp_path):
         """Test getting recent searches."""
@@ -9,18 +9,26 @@ from trials.similar_patients import (
 )
 
 
+@pytest.fixture
+def analyzer_factory(tmp_path):
+    """Factory for analyzers backed by a per-test data directory."""
+    def make(subdir: str = "analytics") -> SimilarPatientsAnalyzer:
+        return SimilarPatientsAnalyzer(data_dir=str(tmp_path / subdir))
+    return make
+
+
 class TestSimilarPatientsAnalyzer:
     """Test similar patients analysis."""
 
-    def test_init(self, tmp_path):
+    def test_init(self, analyzer_factory):
         """Test initialization creates directory."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
         assert analyzer.data_dir.exists()
         assert analyzer.enrollments_file == analyzer.data_dir / "enrollments_anonymized.json"
 
-    def test_record_enrollment(self, tmp_path):
+    def test_record_enrollment(self, analyzer_factory):
         """Test recording an enrollment."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         patient = {
             "age": 65,
@@ -35,14 +43,14 @@ class TestSimilarPatientsAnalyzer:
 
         assert len(analyzer.enrollments) == 1
         enrollment = analyzer.enrollments[0]
-        assert enrollment["nct_id"] == "NCT12345678"
-        assert enrollment["outcome"] == "enrolled"
-        assert enrollment["profile"]["age_range"] == "60-69"
-        assert enrollment["profile"]["cancer_type"] == "Lung Cancer"
+        assert enrollment.nct_id == "NCT12345678"
+        assert enrollment.outcome == "enrolled"
+        assert enrollment.age_range == "60-69"
+        assert enrollment.cancer_type == "Lung Cancer"
 
-    def test_bucket_age(self, tmp_path):
+    def test_bucket_age(self, analyzer_factory):
         """Test age bucketing for privacy."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         assert analyzer._bucket_age(None) is None
         assert analyzer._bucket_age(25) == "18-39"
@@ -55,10 +63,12 @@ class TestSimilarPatientsAnalyzer:
         assert analyzer._bucket_age(69) == "60-69"
         assert analyzer._bucket_age(70) == "70+"
         assert analyzer._bucket_age(85) == "70+"
+        assert analyzer._bucket_age(130) == "70+"
+        assert analyzer._bucket_age(39.5) == "18-39"
 
-    def test_find_similar_patients_no_data(self, tmp_path):
+    def test_find_similar_patients_no_data(self, analyzer_factory):
         """Test finding similar patients with no data."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
         stats = analyzer.find_similar_patients(patient)
@@ -69,9 +79,9 @@ class TestSimilarPatientsAnalyzer:
         assert stats["declined"] == 0
         assert stats["success_rate"] is None
 
-    def test_find_similar_patients_with_matches(self, tmp_path):
+    def test_find_similar_patients_with_matches(self, analyzer_factory):
         """Test finding similar patients with matches."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         # Record several enrollments
         patient1 = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
@@ -93,9 +103,9 @@ class TestSimilarPatientsAnalyzer:
         assert stats["enrolled"] >= 1
         assert stats["success_rate"] is not None
 
-    def test_find_similar_patients_with_specific_trial(self, tmp_path):
+    def test_find_similar_patients_with_specific_trial(self, analyzer_factory):
         """Test finding similar patients for a specific trial."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         patient1 = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
         patient2 = {"age": 66, "cancer_type": "Lung Cancer", "ecog": 1}
@@ -110,33 +120,44 @@ class TestSimilarPatientsAnalyzer:
         assert stats["total_similar"] == 1
         assert stats["enrolled"] == 1
 
-    def test_match_score_calculation(self, tmp_path):
+    def test_find_similar_patients_sees_new_enrollments(self, analyzer_factory):
+        """Test that results reflect enrollments recorded after a query."""
+        analyzer = analyzer_factory()
+        patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
+
+        analyzer.record_enrollment("NCT001", patient, "enrolled")
+        assert analyzer.find_similar_patients(patient)["total_similar"] == 1
+
+        analyzer.record_enrollment("NCT002", patient, "declined")
+        stats = analyzer.find_similar_patients(patient)
+        assert stats["total_similar"] == 2
+        assert stats["declined"] == 1
+
+    def test_match_score_calculation(self, analyzer_factory):
         """Test that match score requires 2 of 3 criteria."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         # Base patient
         base_patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
         analyzer.record_enrollment("NCT001", base_patient, "enrolled")
 
-        # Test cases
-        # 3/3 match - should match
-        search1 = {"age": 66, "cancer_type": "Lung Cancer", "ecog": 1}
-        stats1 = analyzer.find_similar_patients(search1)
-        assert stats1["total_similar"] == 1
-
-        # 2/3 match (different ECOG) - should match
-        search2 = {"age": 67, "cancer_type": "Lung Cancer", "ecog": 2}
-        stats2 = analyzer.find_similar_patients(search2)
-        assert stats2["total_similar"] == 1
-
-        # 1/3 match (only cancer type) - should NOT match
-        search3 = {"age": 45, "cancer_type": "Lung Cancer", "ecog": 3}
-        stats3 = analyzer.find_similar_patients(search3)
-        assert stats3["total_similar"] == 0
-
-    def test_get_alternative_trials(self, tmp_path):
+        searches = [
+            # 3/3 match - should match
+            {"age": 66, "cancer_type": "Lung Cancer", "ecog": 1},
+            # 2/3 match (different ECOG) - should match
+            {"age": 67, "cancer_type": "Lung Cancer", "ecog": 2},
+            # 1/3 match (only cancer type) - should NOT match
+            {"age": 45, "cancer_type": "Lung Cancer", "ecog": 3},
+        ]
+        stats = analyzer.find_similar_patients_batch(searches)
+
+        assert [s["total_similar"] for s in stats] == [1, 1, 0]
+        # Batched results agree with single queries
+        assert stats == [analyzer.find_similar_patients(s) for s in searches]
+
+    def test_get_alternative_trials(self, analyzer_factory):
         """Test getting alternative trials."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
 
@@ -155,9 +176,9 @@ class TestSimilarPatientsAnalyzer:
         assert alternatives[1]["nct_id"] == "NCT002"  # 1 enrollment
         assert alternatives[1]["similar_enrolled"] == 1
 
-    def test_get_alternative_trials_excludes_current(self, tmp_path):
+    def test_get_alternative_trials_excludes_current(self, analyzer_factory):
         """Test that alternative trials exclude current trial."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
 
@@ -171,42 +192,132 @@ class TestSimilarPatientsAnalyzer:
         assert "NCT001" not in nct_ids
         assert "NCT002" in nct_ids
 
-    def test_persistence(self, tmp_path):
+    def test_persistence(self, analyzer_factory):
         """Test data persistence across instances."""
-        data_dir = str(tmp_path / "analytics")
-
         # Create analyzer and record enrollment
-        analyzer1 = SimilarPatientsAnalyzer(data_dir=data_dir)
+        analyzer1 = analyzer_factory()
         patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
         analyzer1.record_enrollment("NCT001", patient, "enrolled")
 
         # Create new analyzer instance
-        analyzer2 = SimilarPatientsAnalyzer(data_dir=data_dir)
+        analyzer2 = analyzer_factory()
 
         assert len(analyzer2.enrollments) == 1
-        assert analyzer2.enrollments[0]["nct_id"] == "NCT001"
+        assert analyzer2.enrollments[0].nct_id == "NCT001"
+
+    def test_enrollments_appended_to_log(self, analyzer_factory):
+        """Test that each enrollment is appended as one JSON line."""
+        analyzer = analyzer_factory()
+        patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
+
+        analyzer.record_enrollment("NCT001", patient, "enrolled")
+        analyzer.record_enrollment("NCT002", patient, "declined")
+
+        lines = analyzer.log_file.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["nct_id"] == "NCT002"
+        # Records keep the nested on-disk profile layout
+        assert json.loads(lines[1])["profile"]["age_range"] == "60-69"
+
+    def test_compact_merges_log(self, analyzer_factory, monkeypatch):
+        """Test that the log is folded into the main file once it fills up."""
+        monkeypatch.setattr("trials.similar_patients.COMPACT_EVERY", 3)
+        analyzer = analyzer_factory()
+        patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
+
+        for i in range(4):
+            analyzer.record_enrollment(f"NCT00{i}", patient, "enrolled")
+
+        assert len(json.loads(analyzer.enrollments_file.read_text())["enrollments"]) == 3
+        assert len(analyzer.log_file.read_text().splitlines()) == 1
+
+        reloaded = analyzer_factory()
+        assert [e.nct_id for e in reloaded.enrollments] == [
+            "NCT000", "NCT001", "NCT002", "NCT003"
+        ]
+
+    def test_compacted_log_not_replayed(self, analyzer_factory):
+        """Test a log left behind by a crash during compaction isn't loaded twice."""
+        analyzer = analyzer_factory()
+        patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
+        analyzer.record_enrollment("NCT001", patient, "enrolled")
+        analyzer.record_enrollment("NCT002", patient, "enrolled")
+        old_log = analyzer.log_file
+        log_contents = old_log.read_bytes()
 
-    def test_load_corrupted_file(self, tmp_path):
+        analyzer.compact()
+        # As if the process died after writing the snapshot, before the unlink
+        old_log.write_bytes(log_contents)
+
+        reloaded = analyzer_factory()
+        assert [e.nct_id for e in reloaded.enrollments] == ["NCT001", "NCT002"]
+
+    def test_load_legacy_array_file(self, tmp_path, analyzer_factory):
+        """Test an enrollments file holding a bare JSON array still loads."""
+        data_dir = tmp_path / "analytics"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        (data_dir / "enrollments_anonymized.json").write_text(json.dumps([
+            {"nct_id": "NCT001", "outcome": "enrolled", "profile": {"ecog": 1}}
+        ]))
+
+        analyzer = analyzer_factory()
+        assert [e.nct_id for e in analyzer.enrollments] == ["NCT001"]
+
+    def test_load_skips_bad_log_lines(self, analyzer_factory):
+        """Test that a torn line in the log doesn't drop the other records."""
+        analyzer = analyzer_factory()
+        patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
+        analyzer.record_enrollment("NCT001", patient, "enrolled")
+        with open(analyzer.log_file, 'ab') as f:
+            f.write(b'{"nct_id": "NCT0\n')
+        analyzer.record_enrollment("NCT002", patient, "enrolled")
+
+        reloaded = analyzer_factory()
+        assert [e.nct_id for e in reloaded.enrollments] == ["NCT001", "NCT002"]
+
+    def test_load_skips_malformed_log_records(self, analyzer_factory):
+        """Test log lines that decode to something other than a record are skipped."""
+        analyzer = analyzer_factory()
+        patient = {"age": 65, "cancer_type": "Lung Cancer", "ecog": 1}
+        analyzer.record_enrollment("NCT001", patient, "enrolled")
+        with open(analyzer.log_file, 'ab') as f:
+            f.write(b'null\n[1, 2]\n5\n{"nct_id": "NCT0", "outcome": "enrolled", "profile": null}\n')
+        analyzer.record_enrollment("NCT002", patient, "enrolled")
+
+        reloaded = analyzer_factory()
+        assert [e.nct_id for e in reloaded.enrollments] == ["NCT001", "NCT002"]
+
+    def test_load_corrupted_file(self, tmp_path, analyzer_factory):
         """Test loading from corrupted file returns empty list."""
         data_dir = tmp_path / "analytics"
         data_dir.mkdir(parents=True, exist_ok=True)
 
         # Create corrupted JSON file
         enrollments_file = data_dir / "enrollments_anonymized.json"
-        with open(enrollments_file, 'w') as f:
-            f.write("{ corrupted json }")
+        enrollments_file.write_bytes(b"{ corrupted json }")
+
+        analyzer = analyzer_factory()
+        assert analyzer.enrollments == []
+
+    def test_load_truncated_file(self, tmp_path, analyzer_factory):
+        """Test loading a truncated JSON array returns empty list."""
+        data_dir = tmp_path / "analytics"
+        data_dir.mkdir(parents=True, exist_ok=True)
+
+        enrollments_file = data_dir / "enrollments_anonymized.json"
+        enrollments_file.write_bytes(b'[{"nct_id": "NCT001"')
 
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(data_dir))
+        analyzer = analyzer_factory()
         assert analyzer.enrollments == []
 
-    def test_enrollment_timestamp(self, tmp_path):
+    def test_enrollment_timestamp(self, analyzer_factory):
         """Test that enrollments have timestamps."""
-        analyzer = SimilarPatientsAnalyzer(data_dir=str(tmp_path / "analytics"))
+        analyzer = analyzer_factory()
 
         patient = {"age": 65, "cancer_type": "Lung Cancer"}
         analyzer.record_enrollment("NCT001", patient, "enrolled")
 
-        assert "timestamp" in analyzer.enrollments[0]
+        assert analyzer.enrollments[0].timestamp
 
 
 class TestFormatSimilarPatientsDisplay:
@@ -5,21 +5,20 @@ Run with: pytest tests/test_streamlit_e2e.py
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from trials.config import config
 
 
-# Note: Streamlit testing requires streamlit >= 1.28.0
-pytest.importorskip("streamlit", minversion="1.28.0")
+# Note: Streamlit testing requires streamlit >= 1.28.0. Only the tests that
+# touch streamlit import it, so the rest run without it installed.
+STREAMLIT_MIN_VERSION = "1.28.0"
 
-from streamlit.testing.v1 import AppTest
 
-
-@pytest.fixture
-def sample_trials_df():
-    """Create sample trials DataFrame for testing."""
+def _make_trials_df() -> pd.DataFrame:
+    """Build the sample trials DataFrame."""
     return pd.DataFrame([
         {
             "trial_id": "NCT12345678",
@@ -37,12 +36,11 @@ def sample_trials_df():
             "brief_summary": "Comparing immunotherapy regimens",
             "start_date": "2024-06-01"
         }
-    ])
+    ]).astype({"status": "category", "phase": "category"})
 
 
-@pytest.fixture
-def sample_eligibility_df():
-    """Create sample eligibility DataFrame."""
+def _make_eligibility_df() -> pd.DataFrame:
+    """Build the sample eligibility DataFrame."""
     return pd.DataFrame([
         {
             "trial_id": "NCT12345678",
@@ -70,20 +68,34 @@ def sample_eligibility_df():
 
 
 @pytest.fixture
-def mock_data_files(tmp_path, sample_trials_df, sample_eligibility_df):
-    """Create mock data files for testing."""
-    data_dir = tmp_path / "data" / "clean"
+def sample_trials_df():
+    """Create sample trials DataFrame for testing."""
+    return _make_trials_df()
+
+
+@pytest.fixture
+def sample_eligibility_df():
+    """Create sample eligibility DataFrame."""
+    return _make_eligibility_df()
+
+
+@pytest.fixture(scope="session")
+def mock_data_files(tmp_path_factory):
+    """Create mock data files for testing.
+
+    Written once per session; tests only read from this directory.
+    """
+    data_dir = tmp_path_factory.mktemp("data") / "clean"
     data_dir.mkdir(parents=True, exist_ok=True)
 
     # Save sample data
-    sample_trials_df.to_parquet(data_dir / "trials.parquet")
-    sample_eligibility_df.to_parquet(data_dir / "eligibility.parquet")
+    _make_trials_df().to_parquet(data_dir / "trials.parquet")
+    _make_eligibility_df().to_parquet(data_dir / "eligibility.parquet")
 
     # Create empty DataFrames for other required files
-    pd.DataFrame().to_parquet(data_dir / "features.parquet")
-    pd.DataFrame().to_parquet(data_dir / "risks.parquet")
-    pd.DataFrame().to_parquet(data_dir / "clinical_details.parquet")
-    pd.DataFrame().to_parquet(data_dir / "locations.parquet")
+    empty = pd.DataFrame()
+    for name in ("features", "risks", "clinical_details", "locations"):
+        empty.to_parquet(data_dir / f"{name}.parquet")
 
     return data_dir
 
@@ -94,6 +106,9 @@ class TestAppInitialization:
     @patch('trials.config.config.CLEAN_DATA_DIR')
     def test_app_loads_successfully(self, mock_data_dir, mock_data_files):
         """Test that the app loads without errors."""
+        pytest.importorskip("streamlit", minversion=STREAMLIT_MIN_VERSION)
+        from streamlit.testing.v1 import AppTest  # noqa: F401
+
         mock_data_dir.return_value = mock_data_files
 
         # This would require the actual app.py to be importable
@@ -128,15 +143,11 @@ class TestPatientMatchingWorkflow:
 
     def test_biomarker_selection(self):
         """Test biomarker checkbox selection."""
-        biomarkers = {
-            "egfr": True,
-            "alk": False,
-            "pdl1": True
-        }
+        biomarkers = frozenset({"egfr", "pdl1"})
 
         # Would test checkbox interactions
         assert "egfr" in biomarkers
-        assert biomarkers["egfr"] is True
+        assert "alk" not in biomarkers
 
     def test_filter_options(self):
         """Test filter option interactions."""
@@ -181,7 +192,7 @@ class TestSearchAndFiltering:
         """Test keyword search in titles."""
         keyword = "immunotherapy"
         results = sample_trials_df[
-            sample_trials_df["title"].str.contains(keyword, case=False)
+            sample_trials_df["title"].str.contains(keyword, case=False, regex=False)
         ]
 
         assert len(results) == 1
@@ -190,7 +201,9 @@ class TestSearchAndFiltering:
     def test_biomarker_matching(self, sample_eligibility_df):
         """Test biomarker-based matching."""
         egfr_trials = sample_eligibility_df[
-            sample_eligibility_df["eligibility_text"].str.contains("EGFR", case=False)
+            sample_eligibility_df["eligibility_text"].str.contains(
+                "EGFR", case=False, regex=False
+            )
         ]
 
         assert len(egfr_trials) == 1
@@ -377,22 +390,26 @@ class TestPerformance:
 
     def test_large_dataset_pagination(self):
         """Test pagination with large dataset."""
-        large_df = pd.DataFrame([
-            {"trial_id": f"NCT{i:08d}", "title": f"Trial {i}"}
-            for i in range(1000)
-        ])
+        ids = np.arange(1000).astype(str)
+        large_df = pd.DataFrame({
+            "trial_id": np.char.add("NCT", np.char.zfill(ids, 8)),
+            "title": np.char.add("Trial ", ids),
+        })
 
         page_size = 10
         page_1 = large_df.iloc[0:page_size]
 
         assert len(page_1) == page_size
+        assert large_df["trial_id"].iloc[999] == "NCT00000999"
 
-    @patch('streamlit.cache_data')
-    def test_data_caching(self, mock_cache):
+    def test_data_caching(self):
         """Test that data loading is cached."""
+        pytest.importorskip("streamlit", minversion=STREAMLIT_MIN_VERSION)
+
         # Would test st.cache_data decorator
-        mock_cache.return_value = lambda f: f
-        assert mock_cache.called or not mock_cache.called  # Placeholder
+        with patch('streamlit.cache_data') as mock_cache:
+            mock_cache.return_value = lambda f: f
+            assert mock_cache.called or not mock_cache.called  # Placeholder
 
 
 class TestAccessibility:
@@ -466,7 +483,7 @@ class TestCompleteUserJourney:
         search_params = {
             "age": 65,
             "cancer_type": "lung cancer",
-            "biomarker": "EGFR"
+            "biomarkers": frozenset({"egfr"})
         }
 
         # Step 2: Filter results
@@ -486,5 +503,6 @@ class TestCompleteUserJourney:
 
         # Verify journey completed
         assert search_params["age"] > 0
+        assert search_params["biomarkers"] & {"egfr", "her2"} == {"egfr"}
         assert filters["recruiting_only"] is True
         assert referral["trial_id"] == selected_trial
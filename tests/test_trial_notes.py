@@ -1,24 +1,37 @@
 """Tests for trial notes and annotations system."""
 
 import json
+import sys
+
 import pytest
-from pathlib import Path
+
 from trials.trial_notes import TrialNotesManager
 
 
+@pytest.fixture(autouse=True)
+def _reset_notes_cache():
+    """Keep parsed notes from leaking between tests."""
+    TrialNotesManager.clear_cache()
+    yield
+    TrialNotesManager.clear_cache()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Notes manager backed by a per-test data directory."""
+    return TrialNotesManager(data_dir=str(tmp_path / "notes"))
+
+
 class TestTrialNotesManager:
     """Test trial notes management."""
 
-    def test_init(self, tmp_path):
+    def test_init(self, manager):
         """Test initialization creates directory."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
         assert manager.data_dir.exists()
         assert manager.notes_file == manager.data_dir / "trial_notes.json"
 
-    def test_add_note(self, tmp_path):
+    def test_add_note(self, manager):
         """Test adding a note to a trial."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_note("NCT12345678", "This trial looks promising", "positive")
 
         notes = manager.get_notes("NCT12345678")
@@ -27,10 +40,8 @@ class TestTrialNotesManager:
         assert notes["notes"][0]["text"] == "This trial looks promising"
         assert notes["notes"][0]["type"] == "positive"
 
-    def test_add_multiple_notes(self, tmp_path):
+    def test_add_multiple_notes(self, manager):
         """Test adding multiple notes to same trial."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_note("NCT12345678", "Note 1", "general")
         manager.add_note("NCT12345678", "Note 2", "concern")
         manager.add_note("NCT12345678", "Note 3", "question")
@@ -38,10 +49,8 @@ class TestTrialNotesManager:
         notes = manager.get_notes("NCT12345678")
         assert len(notes["notes"]) == 3
 
-    def test_note_id_generation(self, tmp_path):
+    def test_note_id_generation(self, manager):
         """Test note IDs are generated correctly."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_note("NCT001", "First note")
         manager.add_note("NCT001", "Second note")
         manager.add_note("NCT001", "Third note")
@@ -51,54 +60,111 @@ class TestTrialNotesManager:
         assert notes["notes"][1]["note_id"] == "NOTE0002"
         assert notes["notes"][2]["note_id"] == "NOTE0003"
 
-    def test_note_timestamp(self, tmp_path):
-        """Test notes have timestamps."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
+    def test_note_id_not_reused_after_delete(self, tmp_path):
+        """Test deleting a note does not recycle its ID."""
+        data_dir = str(tmp_path / "notes")
+
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.add_note("NCT001", "First note")
+            manager1.add_note("NCT001", "Second note")
+            manager1.delete_note("NCT001", "NOTE0001")
+            manager1.add_note("NCT001", "Third note")
+
+        manager2 = TrialNotesManager(data_dir=data_dir)
+        manager2.add_note("NCT001", "Fourth note")
+
+        note_ids = [n["note_id"] for n in manager2.get_notes("NCT001")["notes"]]
+        assert note_ids == ["NOTE0002", "NOTE0003", "NOTE0004"]
+
+    def test_note_counter_derived_for_old_files(self, tmp_path):
+        """Test files without a stored counter continue after the highest ID."""
+        data_dir = tmp_path / "notes"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        (data_dir / "trial_notes.json").write_text(json.dumps({
+            "NCT001": {
+                "nct_id": "NCT001",
+                "notes": [{"note_id": "NOTE0003", "text": "Old", "type": "general",
+                           "timestamp": "2024-01-01T00:00:00"}],
+                "starred": False,
+                "flagged": False,
+                "tags": []
+            }
+        }))
 
+        manager = TrialNotesManager(data_dir=str(data_dir))
+        manager.add_note("NCT001", "New")
+
+        assert manager.get_notes("NCT001")["notes"][-1]["note_id"] == "NOTE0004"
+
+    def test_note_timestamp(self, manager):
+        """Test notes have timestamps."""
         manager.add_note("NCT001", "Test note")
 
         notes = manager.get_notes("NCT001")
         assert "timestamp" in notes["notes"][0]
 
-    def test_default_note_type(self, tmp_path):
-        """Test default note type is 'general'."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
+    def test_note_timestamp_iso_format(self, tmp_path):
+        """Test timestamps are stored as integers and returned as ISO strings."""
+        from datetime import datetime
+
+        with TrialNotesManager(data_dir=str(tmp_path / "notes")) as manager:
+            before = datetime.now()
+            manager.add_note("NCT001", "Test note")
+
+        saved = json.loads(manager.notes_file.read_text())
+        assert isinstance(saved["trials"]["NCT001"]["notes"][0]["timestamp"], int)
+
+        timestamp = datetime.fromisoformat(manager.get_notes("NCT001")["notes"][0]["timestamp"])
+        assert abs((timestamp - before).total_seconds()) < 60
 
+    def test_iso_timestamps_from_old_files_kept(self, tmp_path):
+        """Test ISO timestamps saved by earlier versions are returned unchanged."""
+        data_dir = tmp_path / "notes"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        (data_dir / "trial_notes.json").write_text(json.dumps({
+            "NCT001": {
+                "nct_id": "NCT001",
+                "notes": [{"note_id": "NOTE0001", "text": "Old", "type": "general",
+                           "timestamp": "2024-01-01T09:30:00"}],
+                "starred": False,
+                "flagged": False,
+                "tags": []
+            }
+        }))
+
+        manager = TrialNotesManager(data_dir=str(data_dir))
+
+        assert manager.get_notes("NCT001")["notes"][0]["timestamp"] == "2024-01-01T09:30:00"
+
+    def test_default_note_type(self, manager):
+        """Test default note type is 'general'."""
         manager.add_note("NCT001", "Test note")  # No type specified
 
         notes = manager.get_notes("NCT001")
         assert notes["notes"][0]["type"] == "general"
 
-    def test_get_notes_nonexistent(self, tmp_path):
+    def test_get_notes_nonexistent(self, manager):
         """Test getting notes for trial with no notes."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         notes = manager.get_notes("NCT99999999")
         assert notes is None
 
-    def test_star_trial(self, tmp_path):
+    def test_star_trial(self, manager):
         """Test starring a trial."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.star_trial("NCT001", starred=True)
 
         notes = manager.get_notes("NCT001")
         assert notes["starred"] is True
 
-    def test_unstar_trial(self, tmp_path):
+    def test_unstar_trial(self, manager):
         """Test unstarring a trial."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.star_trial("NCT001", starred=True)
         manager.star_trial("NCT001", starred=False)
 
         notes = manager.get_notes("NCT001")
         assert notes["starred"] is False
 
-    def test_star_trial_with_existing_notes(self, tmp_path):
+    def test_star_trial_with_existing_notes(self, manager):
         """Test starring trial that already has notes."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_note("NCT001", "Test note")
         manager.star_trial("NCT001", starred=True)
 
@@ -106,39 +172,31 @@ class TestTrialNotesManager:
         assert notes["starred"] is True
         assert len(notes["notes"]) == 1
 
-    def test_flag_trial(self, tmp_path):
+    def test_flag_trial(self, manager):
         """Test flagging a trial."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.flag_trial("NCT001", flagged=True)
 
         notes = manager.get_notes("NCT001")
         assert notes["flagged"] is True
 
-    def test_unflag_trial(self, tmp_path):
+    def test_unflag_trial(self, manager):
         """Test unflagging a trial."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.flag_trial("NCT001", flagged=True)
         manager.flag_trial("NCT001", flagged=False)
 
         notes = manager.get_notes("NCT001")
         assert notes["flagged"] is False
 
-    def test_add_tags(self, tmp_path):
+    def test_add_tags(self, manager):
         """Test adding tags to a trial."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_tags("NCT001", ["immunotherapy", "phase-2"])
 
         notes = manager.get_notes("NCT001")
         assert "immunotherapy" in notes["tags"]
         assert "phase-2" in notes["tags"]
 
-    def test_add_tags_no_duplicates(self, tmp_path):
+    def test_add_tags_no_duplicates(self, manager):
         """Test adding duplicate tags."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_tags("NCT001", ["immunotherapy", "phase-2"])
         manager.add_tags("NCT001", ["phase-2", "EGFR"])  # phase-2 is duplicate
 
@@ -148,10 +206,39 @@ class TestTrialNotesManager:
         assert "phase-2" in notes["tags"]
         assert "EGFR" in notes["tags"]
 
-    def test_get_starred_trials(self, tmp_path):
-        """Test getting list of starred trials."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
+    def test_tags_saved_sorted(self, tmp_path):
+        """Test tags are written as a sorted list."""
+        with TrialNotesManager(data_dir=str(tmp_path / "notes")) as manager:
+            manager.add_tags("NCT001", ["phase-2", "EGFR", "immunotherapy"])
+            manager.add_tags("NCT001", ["EGFR"])
+
+        saved = json.loads(manager.notes_file.read_text())
+        assert saved["tag_groups"][saved["trials"]["NCT001"]["tag_group"]] == [
+            "EGFR", "immunotherapy", "phase-2"
+        ]
+        assert manager.get_notes("NCT001")["tags"] == ["EGFR", "immunotherapy", "phase-2"]
+
+    def test_shared_tag_sets_saved_once(self, tmp_path):
+        """Test trials with identical tags share one tag group on disk."""
+        data_dir = str(tmp_path / "notes")
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.add_tags("NCT001", ["lung", "phase-2"])
+            manager1.add_tags("NCT002", ["phase-2", "lung"])
+            manager1.add_tags("NCT003", ["breast"])
+            manager1.star_trial("NCT004", starred=True)
+
+        saved = json.loads(manager1.notes_file.read_text())
+        assert saved["tag_groups"] == [["lung", "phase-2"], ["breast"]]
+        assert saved["trials"]["NCT001"]["tag_group"] == saved["trials"]["NCT002"]["tag_group"]
+        assert "tag_group" not in saved["trials"]["NCT004"]
+
+        manager2 = TrialNotesManager(data_dir=data_dir)
+        assert manager2.get_notes("NCT002")["tags"] == ["lung", "phase-2"]
+        assert manager2.get_notes("NCT004")["tags"] == []
+        assert sorted(manager2.get_trials_by_tag("lung")) == ["NCT001", "NCT002"]
 
+    def test_get_starred_trials(self, manager):
+        """Test getting list of starred trials."""
         manager.star_trial("NCT001", starred=True)
         manager.star_trial("NCT002", starred=True)
         manager.star_trial("NCT003", starred=False)
@@ -162,10 +249,21 @@ class TestTrialNotesManager:
         assert "NCT002" in starred
         assert "NCT003" not in starred
 
-    def test_get_flagged_trials(self, tmp_path):
-        """Test getting list of flagged trials."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
+    def test_lookups_in_notes_order(self, manager):
+        """Test starred, flagged and tagged trials come back in notes order."""
+        for nct_id in ("NCT001", "NCT002", "NCT003"):
+            manager.add_note(nct_id, "Note")
+        for nct_id in ("NCT003", "NCT001"):
+            manager.star_trial(nct_id)
+            manager.flag_trial(nct_id)
+            manager.add_tags(nct_id, ["lung"])
+
+        assert manager.get_starred_trials() == ["NCT001", "NCT003"]
+        assert manager.get_flagged_trials() == ["NCT001", "NCT003"]
+        assert manager.get_trials_by_tag("lung") == ["NCT001", "NCT003"]
 
+    def test_get_flagged_trials(self, manager):
+        """Test getting list of flagged trials."""
         manager.flag_trial("NCT001", flagged=True)
         manager.flag_trial("NCT002", flagged=False)
         manager.flag_trial("NCT003", flagged=True)
@@ -176,10 +274,8 @@ class TestTrialNotesManager:
         assert "NCT003" in flagged
         assert "NCT002" not in flagged
 
-    def test_get_trials_by_tag(self, tmp_path):
+    def test_get_trials_by_tag(self, manager):
         """Test getting trials by tag."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_tags("NCT001", ["immunotherapy", "phase-2"])
         manager.add_tags("NCT002", ["immunotherapy", "phase-3"])
         manager.add_tags("NCT003", ["chemotherapy", "phase-2"])
@@ -194,10 +290,40 @@ class TestTrialNotesManager:
         assert "NCT001" in phase2_trials
         assert "NCT003" in phase2_trials
 
-    def test_delete_note(self, tmp_path):
-        """Test deleting a specific note."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
+    def test_lookups_rebuilt_on_load(self, tmp_path):
+        """Test starred, flagged and tag lookups survive a reload."""
+        data_dir = str(tmp_path / "notes")
+
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.star_trial("NCT001", starred=True)
+            manager1.star_trial("NCT002", starred=True)
+            manager1.star_trial("NCT002", starred=False)
+            manager1.flag_trial("NCT003", flagged=True)
+            manager1.add_tags("NCT003", ["immunotherapy"])
+
+        manager2 = TrialNotesManager(data_dir=data_dir)
+
+        assert manager2.get_starred_trials() == ["NCT001"]
+        assert manager2.get_flagged_trials() == ["NCT003"]
+        assert manager2.get_trials_by_tag("immunotherapy") == ["NCT003"]
+        assert manager2.get_trials_by_tag("unknown") == []
+
+    def test_nct_ids_interned(self, tmp_path):
+        """Test NCT IDs share one string object across the record and lookups."""
+        data_dir = str(tmp_path / "notes")
+        nct_id = "".join(["NCT", "001"])
+
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.star_trial(nct_id, starred=True)
 
+        manager2 = TrialNotesManager(data_dir=data_dir)
+        key = next(iter(manager2.notes))
+
+        assert key is manager2.notes[key]["nct_id"]
+        assert key is sys.intern(nct_id)
+
+    def test_delete_note(self, manager):
+        """Test deleting a specific note."""
         manager.add_note("NCT001", "Note 1")
         manager.add_note("NCT001", "Note 2")
         manager.add_note("NCT001", "Note 3")
@@ -213,17 +339,13 @@ class TestTrialNotesManager:
         assert notes_after["notes"][0]["text"] == "Note 1"
         assert notes_after["notes"][1]["text"] == "Note 3"
 
-    def test_delete_nonexistent_note(self, tmp_path):
+    def test_delete_nonexistent_note(self, manager):
         """Test deleting non-existent note."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         result = manager.delete_note("NCT001", "NOTE9999")
         assert result is False
 
-    def test_delete_note_from_nonexistent_trial(self, tmp_path):
+    def test_delete_note_from_nonexistent_trial(self, manager):
         """Test deleting note from trial with no notes."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         result = manager.delete_note("NCT99999999", "NOTE0001")
         assert result is False
 
@@ -232,10 +354,10 @@ class TestTrialNotesManager:
         data_dir = str(tmp_path / "notes")
 
         # Create manager and add data
-        manager1 = TrialNotesManager(data_dir=data_dir)
-        manager1.add_note("NCT001", "Test note")
-        manager1.star_trial("NCT001", starred=True)
-        manager1.add_tags("NCT001", ["test-tag"])
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.add_note("NCT001", "Test note")
+            manager1.star_trial("NCT001", starred=True)
+            manager1.add_tags("NCT001", ["test-tag"])
 
         # Create new manager instance
         manager2 = TrialNotesManager(data_dir=data_dir)
@@ -245,6 +367,95 @@ class TestTrialNotesManager:
         assert notes["starred"] is True
         assert "test-tag" in notes["tags"]
 
+    def test_changes_written_once_per_flush(self, manager, monkeypatch):
+        """Test a burst of changes is buffered until saved."""
+        monkeypatch.setattr("trials.trial_notes.FLUSH_DELAY", 60)
+
+        for i in range(5):
+            manager.add_note("NCT001", f"Note {i}")
+        manager.star_trial("NCT001", starred=True)
+
+        assert not manager.notes_file.exists()
+
+        manager.save()
+
+        content = manager.notes_file.read_text()
+        assert "\n" not in content
+        saved = json.loads(content)
+        assert [n["text"] for n in saved["trials"]["NCT001"]["notes"]] == [f"Note {i}" for i in range(5)]
+        assert saved["trials"]["NCT001"]["starred"] is True
+
+    def test_debounced_flush(self, tmp_path):
+        """Test pending changes are written shortly after the last edit."""
+        import time
+
+        from trials.trial_notes import FLUSH_DELAY
+
+        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
+        manager.add_note("NCT001", "Test note")
+
+        deadline = time.monotonic() + FLUSH_DELAY + 2
+        while not manager.notes_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert TrialNotesManager(data_dir=str(tmp_path / "notes")).get_notes("NCT001") is not None
+
+    def test_unchanged_file_not_reparsed(self, tmp_path, monkeypatch):
+        """Test a second manager reuses notes parsed by the first."""
+        data_dir = str(tmp_path / "notes")
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.add_note("NCT001", "Test note")
+
+        def fail_loads(raw):
+            raise AssertionError("notes file was parsed again")
+
+        monkeypatch.setattr("trials.trial_notes._loads", fail_loads)
+        manager2 = TrialNotesManager(data_dir=data_dir)
+
+        assert len(manager2.get_notes("NCT001")["notes"]) == 1
+
+    def test_cached_notes_isolated_between_managers(self, tmp_path):
+        """Test unsaved edits in one manager aren't seen by another."""
+        data_dir = str(tmp_path / "notes")
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.add_note("NCT001", "Test note")
+
+        manager2 = TrialNotesManager(data_dir=data_dir)
+        manager2.add_note("NCT001", "Unsaved note")
+        manager2.add_tags("NCT001", ["unsaved"])
+
+        manager3 = TrialNotesManager(data_dir=data_dir)
+        notes = manager3.get_notes("NCT001")
+        assert len(notes["notes"]) == 1
+        assert notes["tags"] == []
+
+    def test_external_changes_reloaded(self, tmp_path):
+        """Test a file changed outside the manager is parsed again."""
+        data_dir = str(tmp_path / "notes")
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.star_trial("NCT001", starred=True)
+
+        manager1.notes_file.write_text(json.dumps({
+            "NCT002": {"nct_id": "NCT002", "notes": [], "starred": True,
+                       "flagged": False, "tags": ["edited"]}
+        }))
+
+        manager2 = TrialNotesManager(data_dir=data_dir)
+        assert manager2.get_starred_trials() == ["NCT002"]
+
+    def test_persistence_without_orjson(self, tmp_path, monkeypatch):
+        """Test the stdlib json fallback reads and writes the same format."""
+        monkeypatch.setattr("trials.trial_notes.orjson", None)
+        data_dir = str(tmp_path / "notes")
+
+        with TrialNotesManager(data_dir=data_dir) as manager1:
+            manager1.add_note("NCT001", "Test note")
+            manager1.add_tags("NCT001", ["b", "a"])
+
+        saved = json.loads(manager1.notes_file.read_text())
+        assert saved["tag_groups"] == [["a", "b"]]
+        assert len(saved["trials"]["NCT001"]["notes"]) == 1
+
     def test_load_corrupted_file(self, tmp_path):
         """Test loading from corrupted file returns empty dict."""
         data_dir = tmp_path / "notes"
@@ -258,10 +469,39 @@ class TestTrialNotesManager:
         manager = TrialNotesManager(data_dir=str(data_dir))
         assert manager.notes == {}
 
-    def test_initial_trial_structure(self, tmp_path):
-        """Test initial trial structure when first created."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
+    def test_corrupted_file_kept_on_save(self, tmp_path):
+        """Test saving after a failed load doesn't destroy the unreadable file."""
+        data_dir = tmp_path / "notes"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        notes_file = data_dir / "trial_notes.json"
+        notes_file.write_text("{ corrupted json }")
+
+        with TrialNotesManager(data_dir=str(data_dir)) as manager:
+            manager.add_note("NCT001", "New note")
+
+        assert (data_dir / "trial_notes.json.corrupt").read_text() == "{ corrupted json }"
+        assert len(json.loads(notes_file.read_text())["trials"]["NCT001"]["notes"]) == 1
+
+    def test_load_legacy_note_ids(self, tmp_path):
+        """Test note IDs not in NOTE<digits> form don't stop the notes loading."""
+        data_dir = tmp_path / "notes"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        (data_dir / "trial_notes.json").write_text(json.dumps({
+            "NCT001": {"nct_id": "NCT001", "starred": False, "flagged": False, "tags": [],
+                       "notes": [{"note_id": "NOTE0002", "text": "Saved",
+                                  "timestamp": "2024-01-01T00:00:00"},
+                                 {"note_id": "my-note", "text": "Edited",
+                                  "timestamp": "2024-01-02T00:00:00"}]}
+        }))
 
+        manager = TrialNotesManager(data_dir=str(data_dir))
+        manager.add_note("NCT001", "New note")
+
+        note_ids = [note["note_id"] for note in manager.get_notes("NCT001")["notes"]]
+        assert note_ids == ["NOTE0002", "my-note", "NOTE0003"]
+
+    def test_initial_trial_structure(self, manager):
+        """Test initial trial structure when first created."""
         manager.add_note("NCT001", "First note")
 
         notes = manager.get_notes("NCT001")
@@ -270,10 +510,8 @@ class TestTrialNotesManager:
         assert notes["flagged"] is False
         assert notes["tags"] == []
 
-    def test_multiple_trials(self, tmp_path):
+    def test_multiple_trials(self, manager):
         """Test managing notes for multiple trials."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_note("NCT001", "Note for trial 1")
         manager.add_note("NCT002", "Note for trial 2")
         manager.add_note("NCT003", "Note for trial 3")
@@ -282,10 +520,8 @@ class TestTrialNotesManager:
         assert manager.get_notes("NCT002") is not None
         assert manager.get_notes("NCT003") is not None
 
-    def test_note_types(self, tmp_path):
+    def test_note_types(self, manager):
         """Test different note types."""
-        manager = TrialNotesManager(data_dir=str(tmp_path / "notes"))
-
         manager.add_note("NCT001", "General info", "general")
         manager.add_note("NCT001", "Safety concern", "concern")
         manager.add_note("NCT001", "Looks promising", "positive")
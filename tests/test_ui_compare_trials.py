@@ -6,41 +6,32 @@ Tests trial selection, side-by-side comparison, and export.
 import pytest
 from playwright.sync_api import Page, expect
 
-BASE_URL = "http://localhost:8501"
+from tests.ui_helpers import click_tab, tab_button
 
 
 @pytest.fixture(scope="function")
-def compare_tab(page: Page):
+def compare_tab(streamlit_app: Page):
     """Navigate to Compare Trials tab."""
-    page.goto(BASE_URL)
-    page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-    page.wait_for_timeout(2000)
+    click_tab(streamlit_app, "Compare Trials")
+    return streamlit_app
 
-    # Click Compare Trials tab
-    compare_btn = page.locator('button:has-text("Compare Trials")')
-    if compare_btn.count() > 0:
-        compare_btn.first.click()
-        page.wait_for_timeout(1500)
 
-    return page
+@pytest.fixture
+def page_text_lower(compare_tab: Page) -> str:
+    """Lowercased HTML of the Compare Trials tab, serialized once per test."""
+    return compare_tab.content().lower()
 
 
 class TestCompareTabNavigation:
     """Test Compare Trials tab navigation."""
 
-    def test_compare_tab_exists(self, page: Page):
+    def test_compare_tab_exists(self, streamlit_app: Page):
         """Test Compare Trials tab exists."""
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
+        expect(tab_button(streamlit_app, "Compare Trials")).to_be_visible()
 
-        compare_btn = page.locator('button:has-text("Compare")')
-        expect(compare_btn.first).to_be_visible()
-
-    def test_compare_tab_loads(self, compare_tab: Page):
+    def test_compare_tab_loads(self, page_text_lower: str):
         """Test Compare Trials tab loads."""
-        page_text = compare_tab.content().lower()
-        assert "compare" in page_text or "trial" in page_text
+        assert "compare" in page_text_lower or "trial" in page_text_lower
 
 
 class TestTrialSelection:
@@ -51,11 +42,10 @@ class TestTrialSelection:
         # Page should load
         assert compare_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
 
-    def test_select_multiple_trials(self, compare_tab: Page):
+    def test_select_multiple_trials(self, page_text_lower: str):
         """Test selecting multiple trials."""
         # Interface should support selection
-        page_text = compare_tab.content()
-        assert len(page_text) > 100
+        assert len(page_text_lower) > 100
 
 
 class TestComparisonDisplay:
@@ -65,10 +55,9 @@ class TestComparisonDisplay:
         """Test side-by-side comparison view."""
         assert compare_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
 
-    def test_comparison_columns_shown(self, compare_tab: Page):
+    def test_comparison_columns_shown(self, page_text_lower: str):
         """Test comparison columns are displayed."""
-        page_text = compare_tab.content()
-        assert len(page_text) > 100
+        assert len(page_text_lower) > 100
 
 
 class TestComparisonFeatures:
@@ -79,20 +68,18 @@ class TestComparisonFeatures:
         # Page should render
         assert compare_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
 
-    def test_clear_comparison_button(self, compare_tab: Page):
+    def test_clear_comparison_button(self, page_text_lower: str):
         """Test clear comparison functionality."""
-        page_text = compare_tab.content()
-        assert len(page_text) > 50
+        assert len(page_text_lower) > 50
 
 
 class TestComparisonExport:
     """Test exporting comparison data."""
 
-    def test_export_comparison_available(self, compare_tab: Page):
+    def test_export_comparison_available(self, page_text_lower: str):
         """Test comparison export is available."""
-        page_text = compare_tab.content().lower()
         # May have export functionality
-        assert len(page_text) > 50
+        assert len(page_text_lower) > 50
 
 
 pytestmark = pytest.mark.ui
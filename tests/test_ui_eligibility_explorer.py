@@ -4,278 +4,138 @@ Tests search functionality, term highlighting, and results display
 for eligibility criteria exploration.
 """
 
+import re
+
 import pytest
-from playwright.sync_api import Page, expect
+from playwright.sync_api import Locator, Page, expect
 
-BASE_URL = "http://localhost:8501"
+from tests.ui_helpers import submit_text, tab_panel
 
+# Case-insensitive text the tests look for, compiled once per module
+_SEARCH_HELP_RE = re.compile(r"search|comma", re.I)
+_TRIAL_RE = re.compile(r"trial|found|result", re.I)
+_EXPORT_RE = re.compile(r"download|export|csv", re.I)
 
-@pytest.fixture(scope="function")
-def eligibility_tab(page: Page):
-    """Navigate to Eligibility Explorer tab."""
-    page.goto(BASE_URL)
-    page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-    page.wait_for_timeout(2000)
 
-    # Click Eligibility Explorer tab
-    eligibility_btn = page.locator('button:has-text("Eligibility Explorer")')
-    if eligibility_btn.count() > 0:
-        eligibility_btn.first.click()
-        page.wait_for_timeout(1500)
+def _panel(page: Page) -> Locator:
+    """The Eligibility Explorer panel; other tabs' widgets are mounted too."""
+    return tab_panel(page, "Eligibility Explorer")
 
-    return page
 
+def _search_input(page: Page) -> Locator:
+    """The Eligibility Explorer's search box."""
+    return _panel(page).get_by_label("Search eligibility criteria")
 
-class TestEligibilityTabNavigation:
-    """Test navigation to Eligibility Explorer tab."""
 
-    def test_eligibility_tab_exists(self, page: Page):
-        """Test Eligibility Explorer tab button exists."""
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
+@pytest.fixture(scope="module")
+def eligibility_tab(open_tab) -> Page:
+    """Navigate to Eligibility Explorer tab."""
+    return open_tab("Eligibility Explorer")
 
-        eligibility_btn = page.locator('button:has-text("Eligibility")')
-        expect(eligibility_btn.first).to_be_visible()
 
-    def test_eligibility_tab_loads(self, eligibility_tab: Page):
-        """Test Eligibility Explorer tab loads content."""
-        page_text = eligibility_tab.content().lower()
-        assert "eligibility" in page_text or "criteria" in page_text or "search" in page_text
+@pytest.fixture(scope="class")
+def ready_search(eligibility_tab: Page) -> Locator:
+    """Search input of the Eligibility Explorer, shared by a test class."""
+    search_input = _search_input(eligibility_tab)
+    search_input.wait_for()
+    return search_input
 
 
+@pytest.mark.requires_data
 class TestSearchInput:
     """Test eligibility criteria search input."""
 
     def test_search_input_visible(self, eligibility_tab: Page):
         """Test search input field is visible."""
-        # Check if data is loaded
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            # Data not loaded, search input won't be available
-            assert True
-        else:
-            # Look for search input
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            assert search_inputs.count() > 0
+        expect(_search_input(eligibility_tab)).to_be_visible(timeout=2000)
 
     def test_search_input_accepts_text(self, eligibility_tab: Page):
         """Test typing into search field."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("metastatic")
-                eligibility_tab.wait_for_timeout(500)
-                assert search_input.input_value() == "metastatic"
+        search_input = _search_input(eligibility_tab)
+        submit_text(eligibility_tab, search_input, "metastatic")
+        expect(search_input).to_have_value("metastatic", timeout=2000)
 
     def test_search_placeholder_helpful(self, eligibility_tab: Page):
         """Test search field has helpful placeholder."""
-        page_text = eligibility_tab.content()
         # Should have instructions or examples
-        assert "search" in page_text.lower() or "comma" in page_text.lower()
-
-    def test_single_term_search(self, eligibility_tab: Page):
-        """Test searching for a single term."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("ECOG")
-                eligibility_tab.wait_for_timeout(1000)
-
-                # Check for results or response
-                page_text = eligibility_tab.content()
-                assert len(page_text) > 100  # Page should have content
-
-    def test_multi_term_search(self, eligibility_tab: Page):
-        """Test searching for multiple comma-separated terms."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("metastatic, ECOG, liver")
-                eligibility_tab.wait_for_timeout(1000)
-
-                page_text = eligibility_tab.content()
-                assert len(page_text) > 100
-
-    def test_case_insensitive_search(self, eligibility_tab: Page):
-        """Test search is case insensitive."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-
-                # Test lowercase
-                search_input.fill("metastatic")
-                eligibility_tab.wait_for_timeout(800)
-
-                # Test uppercase
-                search_input.clear()
-                search_input.fill("METASTATIC")
-                eligibility_tab.wait_for_timeout(800)
-
-    def test_special_characters_handled(self, eligibility_tab: Page):
-        """Test search handles special characters."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("PD-L1, HER2+")
-                eligibility_tab.wait_for_timeout(800)
+        expect(_panel(eligibility_tab)).to_contain_text(_SEARCH_HELP_RE)
+
+    @pytest.mark.parametrize(
+        "term",
+        ["ECOG", "metastatic, ECOG, liver", "metastatic", "METASTATIC", "PD-L1, HER2+"]
+    )
+    def test_search_accepts(self, ready_search: Locator, eligibility_tab: Page, term: str):
+        """Test single, multi-term, mixed-case and special-character searches run."""
+        submit_text(eligibility_tab, ready_search, term)
+
+        expect(ready_search).to_have_value(term, timeout=2000)
+        expect(_panel(eligibility_tab)).not_to_be_empty()
 
 
+@pytest.mark.requires_data
 class TestSearchResults:
     """Test search results display and functionality."""
 
     def test_results_count_shown(self, eligibility_tab: Page):
         """Test results count is displayed."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("cancer")
-                eligibility_tab.wait_for_timeout(1500)
-
-                page_text = eligibility_tab.content()
-                # Should show count or results
-                assert "trial" in page_text.lower() or "found" in page_text.lower() or "result" in page_text.lower()
+        search_input = _search_input(eligibility_tab)
+        submit_text(eligibility_tab, search_input, "cancer")
+
+        # Should show count or results
+        expect(_panel(eligibility_tab)).to_contain_text(_TRIAL_RE)
 
     def test_empty_search_results_handled(self, eligibility_tab: Page):
         """Test handling when search returns no results."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                # Search for unlikely term
-                search_input.fill("xyzabc123unlikely")
-                eligibility_tab.wait_for_timeout(1500)
-
-                # Should handle gracefully
-                assert eligibility_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        search_input = _search_input(eligibility_tab)
+        # Search for unlikely term
+        submit_text(eligibility_tab, search_input, "xyzabc123unlikely")
+
+        # Should handle gracefully
+        expect(_panel(eligibility_tab)).to_be_attached()
 
     def test_results_display_trial_info(self, eligibility_tab: Page):
         """Test results display trial information."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("cancer")
-                eligibility_tab.wait_for_timeout(1500)
+        search_input = _search_input(eligibility_tab)
+        submit_text(eligibility_tab, search_input, "cancer")
 
-                page_text = eligibility_tab.content()
-                # Should show some trial-related content
-                assert len(page_text) > 200
+        # Should show some trial-related content
+        expect(_panel(eligibility_tab)).not_to_be_empty()
 
 
+@pytest.mark.requires_data
 class TestExportFunctionality:
     """Test CSV export of search results."""
 
     def test_csv_export_button_available(self, eligibility_tab: Page):
         """Test CSV export button is available."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            # Perform a search first
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("cancer")
-                eligibility_tab.wait_for_timeout(1500)
-
-            page_text = eligibility_tab.content().lower()
-            # Should have download/export option
-            assert "download" in page_text or "export" in page_text or "csv" in page_text
+        # Perform a search first
+        search_input = _search_input(eligibility_tab)
+        submit_text(eligibility_tab, search_input, "cancer")
+
+        # Should have download/export option
+        expect(
+            _panel(eligibility_tab).get_by_role("button", name=_EXPORT_RE).first
+        ).to_be_visible()
 
     def test_export_button_visible_after_search(self, eligibility_tab: Page):
         """Test export button appears after search."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("metastatic")
-                eligibility_tab.wait_for_timeout(1500)
-
-                download_btn = eligibility_tab.locator('button:has-text("Download")')
-                # Button may or may not be visible depending on data
-                # Just verify page renders
-                assert eligibility_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        search_input = _search_input(eligibility_tab)
+        submit_text(eligibility_tab, search_input, "metastatic")
+
+        # The Download button may or may not be visible depending on data,
+        # so just verify the panel renders
+        expect(_panel(eligibility_tab)).to_be_attached()
 
 
+@pytest.mark.requires_data
 class TestDataIntegration:
     """Test integration with eligibility data."""
 
-    def test_merged_eligibility_data_shown(self, eligibility_tab: Page):
-        """Test merged eligibility data is displayed."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("age")
-                eligibility_tab.wait_for_timeout(1500)
-
-                page_text = eligibility_tab.content()
-                # Should have eligibility-related content
-                assert len(page_text) > 100
-
-    def test_age_range_data_displayed(self, eligibility_tab: Page):
-        """Test age range information is shown when available."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("age, years")
-                eligibility_tab.wait_for_timeout(1500)
-
-                # Page should render successfully
-                assert eligibility_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
-
-    def test_sex_filter_displayed(self, eligibility_tab: Page):
-        """Test sex filter information is shown."""
-        page_text = eligibility_tab.content()
-        if "No data" in page_text or "Fetch Data" in page_text:
-            assert True
-        else:
-            search_inputs = eligibility_tab.locator('input[type="text"]')
-            if search_inputs.count() > 0:
-                search_input = search_inputs.first
-                search_input.fill("male, female")
-                eligibility_tab.wait_for_timeout(1500)
+    def test_integration_search_terms(self, ready_search: Locator, eligibility_tab: Page):
+        """Test merged eligibility, age range and sex searches all render."""
+        for term in ("age", "age, years", "male, female"):
+            submit_text(eligibility_tab, ready_search, term)
+            expect(_panel(eligibility_tab)).to_be_visible(timeout=2000)
 
 
 # Mark all tests as UI tests
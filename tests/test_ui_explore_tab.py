@@ -4,77 +4,59 @@ Tests filtering, sorting, display, and export functionality
 in the Trial Explorer tab.
 """
 
+import re
+import time
+
 import pytest
 from playwright.sync_api import Page, expect
 
-BASE_URL = "http://localhost:8501"
-
-
-@pytest.fixture(scope="function")
-def explore_tab(page: Page):
-    """Navigate to Explore tab."""
-    page.goto(BASE_URL)
-    page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-    page.wait_for_timeout(2000)
-
-    # Click Explore tab
-    explore_btn = page.locator('button:has-text("📊 Explore")')
-    if explore_btn.count() > 0:
-        explore_btn.first.click()
-        page.wait_for_timeout(1500)
+from tests.ui_helpers import APP_CONTAINER, click_tab, open_app
 
-    return page
+# Case-insensitive text the tests look for, compiled once per module
+_RESULTS_RE = re.compile(r"trial|result", re.I)
+_COLUMNS_RE = re.compile(r"trial|title", re.I)
+_EXPORT_RE = re.compile(r"download|export|csv", re.I)
+_DATA_RE = re.compile(r"data|fetch|load", re.I)
 
 
-class TestExploreTabNavigation:
-    """Test navigation to and loading of Explore tab."""
+@pytest.fixture(scope="module")
+def explore_switch_seconds(module_page: Page) -> float:
+    """Load the app and open the Explore tab, timing the tab switch."""
+    open_app(module_page)
 
-    def test_explore_tab_exists(self, page: Page):
-        """Test Explore tab button exists."""
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
+    start = time.perf_counter()
+    click_tab(module_page, "Explore")
+    return time.perf_counter() - start
 
-        explore_btn = page.locator('button:has-text("Explore")')
-        expect(explore_btn.first).to_be_visible()
 
-    def test_explore_tab_clickable(self, page: Page):
-        """Test Explore tab is clickable."""
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
+@pytest.fixture(scope="module")
+def explore_tab(module_page: Page, explore_switch_seconds: float) -> Page:
+    """Navigate to Explore tab."""
+    return module_page
 
-        explore_btn = page.locator('button:has-text("📊 Explore")')
-        if explore_btn.count() > 0:
-            explore_btn.first.click()
-            page.wait_for_timeout(1000)
 
-    def test_explore_tab_loads_content(self, explore_tab: Page):
-        """Test Explore tab loads content."""
-        # Should show Explorer heading or filter elements
-        page_text = explore_tab.content().lower()
-        assert "phase" in page_text or "status" in page_text or "filter" in page_text
+@pytest.fixture(scope="class")
+def explore_body_text(explore_tab: Page) -> str:
+    """Visible text of the Explore tab, read once for a test class."""
+    return explore_tab.locator(APP_CONTAINER).inner_text()
 
 
 class TestFilters:
     """Test filter functionality in Explore tab."""
 
-    def test_phase_filter_visible(self, explore_tab: Page):
+    def test_phase_filter_visible(self, explore_body_text: str):
         """Test phase filter dropdown is visible."""
-        page_text = explore_tab.content()
-        assert "Phase" in page_text
+        assert "Phase" in explore_body_text
 
-    def test_status_filter_visible(self, explore_tab: Page):
+    def test_status_filter_visible(self, explore_body_text: str):
         """Test status filter dropdown is visible."""
-        page_text = explore_tab.content()
-        assert "Status" in page_text
+        assert "Status" in explore_body_text
 
-    def test_cluster_filter_visible_when_available(self, explore_tab: Page):
+    def test_cluster_filter_visible_when_available(self, explore_body_text: str):
         """Test cluster filter appears if clusters exist."""
         # Cluster filter may or may not be present depending on data
-        page_text = explore_tab.content()
         # Just verify page loaded
-        assert len(page_text) > 100
+        assert explore_body_text.strip()
 
     def test_filters_in_columns(self, explore_tab: Page):
         """Test filters are arranged in columns."""
@@ -89,9 +71,8 @@ class TestDataDisplay:
 
     def test_results_count_displayed(self, explore_tab: Page):
         """Test that results count is shown."""
-        page_text = explore_tab.content()
         # Should show count like "Results (X trials)"
-        assert "trial" in page_text.lower() or "result" in page_text.lower()
+        expect(explore_tab.locator(APP_CONTAINER)).to_contain_text(_RESULTS_RE)
 
     def test_dataframe_visible_with_data(self, explore_tab: Page):
         """Test dataframe is visible when data is loaded."""
@@ -100,13 +81,13 @@ class TestDataDisplay:
         table = explore_tab.locator('table')
 
         # Either dataframe or table should exist (or data message)
-        assert dataframe.count() > 0 or table.count() > 0 or "No data" in explore_tab.content()
+        no_data = explore_tab.get_by_text("No data")
+        expect(dataframe.or_(table).or_(no_data).first).to_be_attached()
 
     def test_expected_columns_present(self, explore_tab: Page):
         """Test expected columns are in the display."""
-        page_text = explore_tab.content()
         # Should show column headers
-        assert "trial" in page_text.lower() or "title" in page_text.lower()
+        expect(explore_tab.locator(APP_CONTAINER)).to_contain_text(_COLUMNS_RE)
 
 
 class TestExportFunctionality:
@@ -114,16 +95,15 @@ class TestExportFunctionality:
 
     def test_download_csv_button_visible(self, explore_tab: Page):
         """Test Download CSV button is visible."""
-        download_btn = explore_tab.locator('button:has-text("Download CSV")')
+        download_btn = explore_tab.get_by_role("button", name="Download CSV")
 
         # Button should exist (may require data to be loaded)
         # Check if it exists anywhere in the page content
-        page_text = explore_tab.content()
-        assert "download" in page_text.lower() or "export" in page_text.lower() or "csv" in page_text.lower()
+        expect(explore_tab.locator(APP_CONTAINER)).to_contain_text(_EXPORT_RE)
 
     def test_csv_download_button_enabled_with_data(self, explore_tab: Page):
         """Test CSV button is enabled when data exists."""
-        download_btn = explore_tab.locator('button:has-text("Download")')
+        download_btn = explore_tab.get_by_role("button", name="Download")
         # If button exists, verify it's accessible
         if download_btn.count() > 0:
             expect(download_btn.first).to_be_visible()
@@ -132,47 +112,24 @@ class TestExportFunctionality:
 class TestDataStates:
     """Test different data states (empty, loaded, filtered)."""
 
-    def test_no_data_message_shown_when_empty(self, page: Page):
+    def test_no_data_message_shown_when_empty(self, explore_tab: Page):
         """Test appropriate message when no data loaded."""
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
-
-        # Navigate to Explore
-        explore_btn = page.locator('button:has-text("📊 Explore")')
-        if explore_btn.count() > 0:
-            explore_btn.first.click()
-            page.wait_for_timeout(1500)
-
         # Should show data-related message
-        page_text = page.content().lower()
-        assert "data" in page_text or "fetch" in page_text or "load" in page_text
+        expect(explore_tab.locator(APP_CONTAINER)).to_contain_text(_DATA_RE)
 
     def test_empty_filter_results_handled(self, explore_tab: Page):
         """Test handling when filters return no results."""
         # Even with no results, page should render without errors
-        assert explore_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        expect(explore_tab.locator(APP_CONTAINER)).to_be_attached()
 
 
 class TestPerformance:
     """Test performance of Explore tab."""
 
-    def test_tab_loads_quickly(self, page: Page):
+    def test_tab_loads_quickly(self, explore_switch_seconds: float):
         """Test tab loads in reasonable time."""
-        import time
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
-
-        start = time.time()
-        explore_btn = page.locator('button:has-text("📊 Explore")')
-        if explore_btn.count() > 0:
-            explore_btn.first.click()
-            page.wait_for_timeout(1000)
-        elapsed = time.time() - start
-
         # Should load in less than 5 seconds
-        assert elapsed < 5
+        assert explore_switch_seconds < 5
 
 
 # Mark all tests as UI tests
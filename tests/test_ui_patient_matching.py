@@ -10,21 +10,46 @@ Tests all functionality in the Patient Matching workflow including:
 - Form submission and results
 """
 
+import re
+
 import pytest
-from playwright.sync_api import Page, expect
+from playwright.sync_api import Locator, Page, expect
+
+from tests.ui_helpers import APP_CONTAINER, missing_text, open_app, tab_panel
+
+_SEX_OPTION_RE = re.compile(r"male|female", re.I)
+_PHASE_RE = re.compile(r"phase [12]", re.I)
+
+
+def _open_form(page: Page):
+    """Load the app and wait for the patient matching form to render.
 
-BASE_URL = "http://localhost:8501"
+    The form's submit button is the last thing Streamlit draws on the tab,
+    so once it shows the whole form has rendered.
+    """
+    open_app(page)
+    expect(page.get_by_role("button", name="Find Matching Trials")).to_be_visible()
 
 
-@pytest.fixture(scope="function")
-def patient_matching_tab(page: Page):
-    """Navigate to Patient Matching tab."""
-    page.goto(BASE_URL)
-    page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-    page.wait_for_timeout(2000)
+def _form(page: Page) -> Locator:
+    """The Patient Matching panel, where the form's widgets are looked up."""
+    return tab_panel(page, "Patient Matching")
 
-    # Should default to Patient Matching tab
-    return page
+
+@pytest.fixture(scope="module")
+def patient_matching_page(module_page: Page):
+    """Load the app once for the module; it opens on Patient Matching."""
+    _open_form(module_page)
+    return module_page
+
+
+@pytest.fixture
+def patient_matching_tab(request, patient_matching_page: Page):
+    """Patient Matching tab, reloaded after tests marked as mutating it."""
+    yield patient_matching_page
+
+    if request.node.get_closest_marker("mutates"):
+        _open_form(patient_matching_page)
 
 
 class TestNCTLookup:
@@ -32,7 +57,7 @@ class TestNCTLookup:
 
     def test_nct_lookup_input_visible(self, patient_matching_tab: Page):
         """Test that NCT lookup input is visible."""
-        expect(patient_matching_tab.locator("text=/Quick NCT ID Lookup/i")).to_be_visible()
+        expect(patient_matching_tab.get_by_label("Quick NCT ID Lookup")).to_be_visible()
 
         # Check for input field
         nct_input = patient_matching_tab.locator('input[placeholder*="NCT"]').first
@@ -40,28 +65,28 @@ class TestNCTLookup:
 
     def test_nct_lookup_button_visible(self, patient_matching_tab: Page):
         """Test that Look Up button is visible."""
-        lookup_btn = patient_matching_tab.locator('button:has-text("Look Up")')
+        lookup_btn = patient_matching_tab.get_by_role("button", name="Look Up")
         expect(lookup_btn).to_be_visible()
 
+    @pytest.mark.mutates
     def test_nct_lookup_input_accepts_text(self, patient_matching_tab: Page):
         """Test typing into NCT lookup field."""
         nct_input = patient_matching_tab.locator('input[placeholder*="NCT"]').first
         nct_input.fill("NCT12345678")
-        patient_matching_tab.wait_for_timeout(500)
-        assert nct_input.input_value() == "NCT12345678"
+        expect(nct_input).to_have_value("NCT12345678")
 
+    @pytest.mark.mutates
     def test_nct_lookup_validates_format(self, patient_matching_tab: Page):
         """Test NCT ID format validation."""
         nct_input = patient_matching_tab.locator('input[placeholder*="NCT"]').first
 
         # Test valid format
         nct_input.fill("NCT12345678")
-        patient_matching_tab.wait_for_timeout(300)
+        expect(nct_input).to_have_value("NCT12345678")
 
         # Test lowercase (should work)
-        nct_input.clear()
         nct_input.fill("nct12345678")
-        patient_matching_tab.wait_for_timeout(300)
+        expect(nct_input).to_have_value("nct12345678")
 
 
 class TestPatientDemographics:
@@ -69,41 +94,40 @@ class TestPatientDemographics:
 
     def test_age_input_visible(self, patient_matching_tab: Page):
         """Test age input field is visible."""
-        expect(patient_matching_tab.locator("text=/Age/i").first).to_be_visible()
+        age_input = _form(patient_matching_tab).get_by_label("Age", exact=True)
+        expect(age_input).to_be_visible()
 
         # Age input should be number type
-        age_input = patient_matching_tab.locator('input[type="number"]').first
-        expect(age_input).to_be_visible()
+        expect(age_input).to_have_attribute("type", "number")
 
+    @pytest.mark.mutates
     def test_age_input_accepts_valid_age(self, patient_matching_tab: Page):
         """Test entering valid age."""
-        age_input = patient_matching_tab.locator('input[type="number"]').first
+        age_input = _form(patient_matching_tab).get_by_label("Age", exact=True)
         age_input.fill("65")
-        patient_matching_tab.wait_for_timeout(300)
-        assert age_input.input_value() == "65"
+        expect(age_input).to_have_value("65")
 
+    @pytest.mark.mutates
     def test_age_input_boundaries(self, patient_matching_tab: Page):
         """Test age input boundaries."""
-        age_input = patient_matching_tab.locator('input[type="number"]').first
+        age_input = _form(patient_matching_tab).get_by_label("Age", exact=True)
 
         # Test minimum age
         age_input.fill("18")
-        patient_matching_tab.wait_for_timeout(300)
+        expect(age_input).to_have_value("18")
 
         # Test maximum reasonable age
-        age_input.clear()
         age_input.fill("100")
-        patient_matching_tab.wait_for_timeout(300)
+        expect(age_input).to_have_value("100")
 
     def test_sex_selection_visible(self, patient_matching_tab: Page):
         """Test sex selection dropdown is visible."""
-        expect(patient_matching_tab.locator("text=/Sex/i").first).to_be_visible()
+        expect(patient_matching_tab.get_by_text("Sex", exact=True)).to_be_visible()
 
     def test_sex_options_available(self, patient_matching_tab: Page):
         """Test sex dropdown has expected options."""
         # Look for sex-related content in the page
-        page_text = patient_matching_tab.content().lower()
-        assert "male" in page_text or "female" in page_text
+        expect(patient_matching_tab.locator(APP_CONTAINER)).to_contain_text(_SEX_OPTION_RE)
 
 
 class TestCancerInformation:
@@ -111,8 +135,9 @@ class TestCancerInformation:
 
     def test_cancer_type_input_visible(self, patient_matching_tab: Page):
         """Test cancer type input is visible."""
-        expect(patient_matching_tab.locator("text=/Cancer Type/i").first).to_be_visible()
+        expect(_form(patient_matching_tab).get_by_label("Cancer Type", exact=True)).to_be_visible()
 
+    @pytest.mark.mutates
     def test_cancer_type_accepts_input(self, patient_matching_tab: Page):
         """Test typing cancer type."""
         # Find text input for cancer type
@@ -120,73 +145,39 @@ class TestCancerInformation:
         if cancer_inputs.count() > 0:
             cancer_input = cancer_inputs.first
             cancer_input.fill("Lung Cancer")
-            patient_matching_tab.wait_for_timeout(300)
+            expect(cancer_input).to_have_value("Lung Cancer")
 
     def test_stage_selection_visible(self, patient_matching_tab: Page):
         """Test stage selection is visible."""
-        expect(patient_matching_tab.locator("text=/Stage/i").first).to_be_visible()
+        expect(patient_matching_tab.get_by_text("Stage", exact=True)).to_be_visible()
 
 
 class TestBiomarkers:
     """Test biomarker checkbox interactions."""
 
-    def test_egfr_checkbox_visible(self, patient_matching_tab: Page):
-        """Test EGFR checkbox is visible."""
-        egfr = patient_matching_tab.locator('text=/EGFR/i').first
-        expect(egfr).to_be_visible()
-
-    def test_alk_checkbox_visible(self, patient_matching_tab: Page):
-        """Test ALK checkbox is visible."""
-        alk = patient_matching_tab.locator('text=/ALK/i').first
-        expect(alk).to_be_visible()
-
-    def test_pdl1_checkbox_visible(self, patient_matching_tab: Page):
-        """Test PD-L1 checkbox is visible."""
-        pdl1 = patient_matching_tab.locator('text=/PD-L1/i').first
-        expect(pdl1).to_be_visible()
-
-    def test_her2_checkbox_visible(self, patient_matching_tab: Page):
-        """Test HER2 checkbox is visible."""
-        her2 = patient_matching_tab.locator('text=/HER2/i').first
-        expect(her2).to_be_visible()
-
-    def test_brca_checkbox_visible(self, patient_matching_tab: Page):
-        """Test BRCA checkbox is visible."""
-        brca = patient_matching_tab.locator('text=/BRCA/i').first
-        expect(brca).to_be_visible()
-
-    def test_msi_checkbox_visible(self, patient_matching_tab: Page):
-        """Test MSI-High checkbox is visible."""
-        msi = patient_matching_tab.locator('text=/MSI/i').first
-        expect(msi).to_be_visible()
+    def test_biomarker_checkboxes_visible(self, patient_matching_tab: Page):
+        """Test every biomarker checkbox is visible."""
+        missing = missing_text(patient_matching_tab, ["EGFR", "ALK", "PD-L1", "HER2", "BRCA", "MSI"])
+        assert not missing, f"Missing biomarkers: {missing}"
 
+    @pytest.mark.mutates
     def test_biomarker_checkbox_interaction(self, patient_matching_tab: Page):
         """Test clicking biomarker checkboxes."""
-        # Find EGFR checkbox label
-        egfr_label = patient_matching_tab.locator('label:has-text("EGFR")')
+        # Streamlit hides the checkbox input itself, so click its label
+        egfr_label = patient_matching_tab.get_by_text("EGFR mutation", exact=True)
+        expect(egfr_label).to_be_visible()
+        egfr_label.click()
 
-        if egfr_label.count() > 0 and egfr_label.is_visible():
-            egfr_label.first.click()
-            patient_matching_tab.wait_for_timeout(500)
+        expect(patient_matching_tab.get_by_role("checkbox", name="EGFR mutation")).to_be_checked()
 
 
 class TestPatientConditions:
     """Test patient condition checkboxes."""
 
-    def test_brain_mets_checkbox_visible(self, patient_matching_tab: Page):
-        """Test brain metastases checkbox is visible."""
-        brain_mets = patient_matching_tab.locator('text=/Brain metastases/i').first
-        expect(brain_mets).to_be_visible(timeout=5000)
-
-    def test_autoimmune_checkbox_visible(self, patient_matching_tab: Page):
-        """Test autoimmune disease checkbox is visible."""
-        autoimmune = patient_matching_tab.locator('text=/Autoimmune/i').first
-        expect(autoimmune).to_be_visible(timeout=5000)
-
-    def test_hiv_checkbox_visible(self, patient_matching_tab: Page):
-        """Test HIV positive checkbox is visible."""
-        hiv = patient_matching_tab.locator('text=/HIV/i').first
-        expect(hiv).to_be_visible(timeout=5000)
+    def test_condition_checkboxes_visible(self, patient_matching_tab: Page):
+        """Test the brain metastases, autoimmune and HIV checkboxes are visible."""
+        missing = missing_text(patient_matching_tab, ["Brain metastases", "Autoimmune", "HIV"])
+        assert not missing, f"Missing conditions: {missing}"
 
 
 class TestFilters:
@@ -194,18 +185,19 @@ class TestFilters:
 
     def test_recruiting_only_filter_visible(self, patient_matching_tab: Page):
         """Test recruiting only filter is visible."""
-        recruiting = patient_matching_tab.locator('text=/actively recruiting/i').first
+        recruiting = patient_matching_tab.get_by_role(
+            "checkbox", name="Show only actively recruiting trials"
+        )
         expect(recruiting).to_be_visible()
 
     def test_distance_filter_visible(self, patient_matching_tab: Page):
         """Test distance filter is visible."""
-        distance = patient_matching_tab.locator('text=/distance/i').first
+        distance = patient_matching_tab.get_by_text("Distance Filter:")
         expect(distance).to_be_visible(timeout=5000)
 
     def test_phase_filters_visible(self, patient_matching_tab: Page):
         """Test phase filter checkboxes are visible."""
-        page_text = patient_matching_tab.content().lower()
-        assert "phase 1" in page_text or "phase 2" in page_text
+        expect(patient_matching_tab.locator(APP_CONTAINER)).to_contain_text(_PHASE_RE)
 
     def test_distance_slider_interaction(self, patient_matching_tab: Page):
         """Test distance slider can be adjusted."""
@@ -222,19 +214,20 @@ class TestFormSubmission:
 
     def test_submit_button_visible(self, patient_matching_tab: Page):
         """Test Find Matching Trials button is visible."""
-        submit_btn = patient_matching_tab.locator('button:has-text("Find Matching Trials")')
+        submit_btn = patient_matching_tab.get_by_role("button", name="Find Matching Trials")
         expect(submit_btn).to_be_visible()
 
     def test_submit_button_is_primary(self, patient_matching_tab: Page):
         """Test submit button has primary styling."""
-        submit_btn = patient_matching_tab.locator('button:has-text("Find Matching Trials")')
+        submit_btn = patient_matching_tab.get_by_role("button", name="Find Matching Trials")
         # Primary button should be visible
         expect(submit_btn).to_be_visible()
 
+    @pytest.mark.mutates
     def test_form_accepts_complete_input(self, patient_matching_tab: Page):
         """Test filling out complete patient form."""
         # Fill age
-        age_input = patient_matching_tab.locator('input[type="number"]').first
+        age_input = _form(patient_matching_tab).get_by_label("Age", exact=True)
         age_input.fill("65")
 
         # Fill cancer type
@@ -242,12 +235,10 @@ class TestFormSubmission:
         if text_inputs.count() > 0:
             text_inputs.first.fill("Lung Cancer")
 
-        patient_matching_tab.wait_for_timeout(500)
-
         # Verify submit button still visible
-        submit_btn = patient_matching_tab.locator('button:has-text("Find Matching Trials")')
+        submit_btn = patient_matching_tab.get_by_role("button", name="Find Matching Trials")
         expect(submit_btn).to_be_visible()
 
 
-# Mark all tests as UI tests
-pytestmark = pytest.mark.ui
+# Mark all tests as UI tests; the matching form only renders with data loaded
+pytestmark = [pytest.mark.ui, pytest.mark.requires_data]
@@ -3,58 +3,45 @@
 Tests referral tracking, status updates, and management features.
 """
 
+import re
+
 import pytest
 from playwright.sync_api import Page, expect
 
-BASE_URL = "http://localhost:8501"
+from tests.ui_helpers import APP_CONTAINER, click_tab, tab_button
+
+_REFERRAL_RE = re.compile(r"referral|patient", re.I)
 
 
 @pytest.fixture(scope="function")
-def referrals_tab(page: Page):
+def referrals_tab(streamlit_app: Page):
     """Navigate to My Referrals tab."""
-    page.goto(BASE_URL)
-    page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-    page.wait_for_timeout(2000)
-
-    # Click My Referrals tab
-    referrals_btn = page.locator('button:has-text("My Referrals")')
-    if referrals_btn.count() > 0:
-        referrals_btn.first.click()
-        page.wait_for_timeout(1500)
-
-    return page
+    click_tab(streamlit_app, "My Referrals")
+    return streamlit_app
 
 
 class TestReferralsTabNavigation:
     """Test My Referrals tab navigation."""
 
-    def test_referrals_tab_exists(self, page: Page):
+    def test_referrals_tab_exists(self, streamlit_app: Page):
         """Test My Referrals tab exists."""
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
-
-        referrals_btn = page.locator('button:has-text("Referrals")')
-        expect(referrals_btn.first).to_be_visible()
+        expect(tab_button(streamlit_app, "My Referrals")).to_be_visible()
 
     def test_referrals_tab_loads(self, referrals_tab: Page):
         """Test Referrals tab loads."""
-        page_text = referrals_tab.content().lower()
-        assert "referral" in page_text or "patient" in page_text
+        expect(referrals_tab.locator(APP_CONTAINER)).to_contain_text(_REFERRAL_RE)
 
 
 class TestReferralsList:
     """Test referrals list display."""
 
-    def test_referrals_list_displayed(self, referrals_tab: Page):
-        """Test referrals list is displayed."""
-        # Page should render
-        assert referrals_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+    def test_container_visible(self, referrals_tab: Page):
+        """Test the referrals view is rendered."""
+        expect(referrals_tab.locator(APP_CONTAINER)).to_be_visible()
 
     def test_empty_referrals_handled(self, referrals_tab: Page):
         """Test empty referrals state."""
-        page_text = referrals_tab.content()
-        assert len(page_text) > 50
+        expect(referrals_tab.locator(APP_CONTAINER)).not_to_be_empty()
 
 
 class TestAddReferral:
@@ -62,15 +49,7 @@ class TestAddReferral:
 
     def test_add_referral_interface(self, referrals_tab: Page):
         """Test add referral form exists."""
-        page_text = referrals_tab.content()
-        assert len(page_text) > 100
-
-    def test_referral_form_fields(self, referrals_tab: Page):
-        """Test referral form has required fields."""
-        # Page should have form elements
-        inputs = referrals_tab.locator('input')
-        # May or may not have inputs depending on state
-        assert referrals_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        expect(referrals_tab.locator(APP_CONTAINER)).not_to_be_empty()
 
 
 class TestReferralStatus:
@@ -78,23 +57,8 @@ class TestReferralStatus:
 
     def test_status_dropdown_available(self, referrals_tab: Page):
         """Test status selection is available."""
-        page_text = referrals_tab.content().lower()
         # May have status options
-        assert len(page_text) > 50
-
-    def test_update_referral_status(self, referrals_tab: Page):
-        """Test updating referral status."""
-        # Interface should support status updates
-        assert referrals_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
-
-
-class TestReferralNotes:
-    """Test referral notes functionality."""
-
-    def test_add_notes_to_referral(self, referrals_tab: Page):
-        """Test adding notes to referrals."""
-        # Page should render
-        assert referrals_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        expect(referrals_tab.locator(APP_CONTAINER)).not_to_be_empty()
 
 
 class TestReferralFiltering:
@@ -102,13 +66,7 @@ class TestReferralFiltering:
 
     def test_search_referrals(self, referrals_tab: Page):
         """Test searching referrals."""
-        page_text = referrals_tab.content()
-        assert len(page_text) > 50
-
-    def test_filter_by_status(self, referrals_tab: Page):
-        """Test filtering referrals by status."""
-        # Interface should exist
-        assert referrals_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        expect(referrals_tab.locator(APP_CONTAINER)).not_to_be_empty()
 
 
 class TestReferralStats:
@@ -116,8 +74,7 @@ class TestReferralStats:
 
     def test_referral_statistics_shown(self, referrals_tab: Page):
         """Test referral statistics are displayed."""
-        page_text = referrals_tab.content()
-        assert len(page_text) > 50
+        expect(referrals_tab.locator(APP_CONTAINER)).not_to_be_empty()
 
 
 class TestReferralExport:
@@ -125,17 +82,7 @@ class TestReferralExport:
 
     def test_export_referrals_available(self, referrals_tab: Page):
         """Test referral export is available."""
-        page_text = referrals_tab.content().lower()
-        assert len(page_text) > 50
-
-
-class TestEMRIntegration:
-    """Test EMR integration features."""
-
-    def test_emr_export_available(self, referrals_tab: Page):
-        """Test EMR export functionality."""
-        # Page should load
-        assert referrals_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        expect(referrals_tab.locator(APP_CONTAINER)).not_to_be_empty()
 
 
 pytestmark = pytest.mark.ui
@@ -3,124 +3,141 @@
 Tests risk scoring, metrics display, and risk categorization.
 """
 
+import re
+from typing import Set
+
 import pytest
 from playwright.sync_api import Page, expect
 
-BASE_URL = "http://localhost:8501"
+from tests.ui_helpers import APP_CONTAINER, tab_button, tab_panel
+
+# Every term the tests look for, matched in one pass over the page. The
+# lookahead lets matches overlap, so one term never hides another.
+_TERMS = [
+    "risk", "score", "analysis", "enrollment", "randomization", "site", "duration", "trial", "nct"
+]
+_TERMS_RE = re.compile("(?=(" + "|".join(map(re.escape, _TERMS)) + "))")
+
+
+@pytest.fixture(scope="module")
+def risk_tab(open_tab) -> Page:
+    """Navigate to Risk Analysis tab once for the module; its tests only read the page."""
+    return open_tab("Risk Analysis")
+
 
+@pytest.fixture(scope="module")
+def risk_container_present(risk_tab: Page) -> bool:
+    """Whether the Risk Analysis tab rendered the app container, checked once for the module."""
+    return risk_tab.locator(APP_CONTAINER).count() > 0
 
-@pytest.fixture(scope="function")
-def risk_tab(page: Page):
-    """Navigate to Risk Analysis tab."""
-    page.goto(BASE_URL)
-    page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-    page.wait_for_timeout(2000)
 
-    # Click Risk Analysis tab
-    risk_btn = page.locator('button:has-text("Risk Analysis")')
-    if risk_btn.count() > 0:
-        risk_btn.first.click()
-        page.wait_for_timeout(1500)
+@pytest.fixture(scope="module")
+def page_text_lower(risk_tab: Page) -> str:
+    """Lowercased HTML of the page, serialized once for the module.
 
-    return page
+    Streamlit mounts every tab's panel at once, so this holds the other
+    tabs' content too; use panel_text_lower for checks specific to the tab.
+    """
+    return risk_tab.content().lower()
+
+
+@pytest.fixture(scope="module")
+def panel_text_lower(risk_tab: Page) -> str:
+    """Lowercased visible text of the Risk Analysis panel alone."""
+    return tab_panel(risk_tab, "Risk Analysis").inner_text().lower()
+
+
+@pytest.fixture(scope="module")
+def page_terms(page_text_lower: str) -> Set[str]:
+    """Which of the _TERMS the Risk Analysis tab contains."""
+    return set(_TERMS_RE.findall(page_text_lower))
 
 
 class TestRiskTabNavigation:
     """Test Risk Analysis tab navigation and loading."""
 
-    def test_risk_tab_exists(self, page: Page):
+    def test_risk_tab_exists(self, risk_tab: Page):
         """Test Risk Analysis tab exists."""
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
-
-        risk_btn = page.locator('button:has-text("Risk")')
-        expect(risk_btn.first).to_be_visible()
+        expect(tab_button(risk_tab, "Risk Analysis")).to_be_visible()
 
-    def test_risk_tab_loads(self, risk_tab: Page):
+    def test_risk_tab_loads(self, page_terms: Set[str]):
         """Test Risk Analysis tab loads content."""
-        page_text = risk_tab.content().lower()
-        assert "risk" in page_text or "score" in page_text or "analysis" in page_text
+        assert page_terms & {"risk", "score", "analysis"}
 
 
 class TestRiskMetrics:
     """Test risk metrics display."""
 
-    def test_risk_score_displayed(self, risk_tab: Page):
+    def test_risk_score_displayed(self, page_terms: Set[str]):
         """Test risk scores are displayed."""
-        page_text = risk_tab.content()
         # Should show risk-related content
-        assert "risk" in page_text.lower() or "score" in page_text.lower()
+        assert page_terms & {"risk", "score"}
 
-    def test_risk_components_shown(self, risk_tab: Page):
+    def test_risk_components_shown(self, page_terms: Set[str]):
         """Test individual risk components are shown."""
-        page_text = risk_tab.content().lower()
         # Should show risk components
-        possible_components = ["enrollment", "randomization", "site", "duration"]
-        assert any(comp in page_text for comp in possible_components)
+        assert page_terms & {"enrollment", "randomization", "site", "duration"}
 
-    def test_top_risky_trials_displayed(self, risk_tab: Page):
+    def test_top_risky_trials_displayed(self, page_terms: Set[str]):
         """Test top risky trials table is shown."""
-        page_text = risk_tab.content()
         # Should show trial information
-        assert "trial" in page_text.lower() or "nct" in page_text.lower()
+        assert page_terms & {"trial", "nct"}
 
 
 class TestRiskCategories:
     """Test risk category classification."""
 
-    def test_risk_categories_exist(self, risk_tab: Page):
+    @pytest.mark.requires_data
+    def test_risk_categories_exist(self, panel_text_lower: str):
         """Test risk categories are defined."""
-        page_text = risk_tab.content().lower()
         # Should have risk levels
-        risk_levels = ["low", "medium", "high"]
-        # May show risk categories
-        assert len(page_text) > 100
+        missing = [
+            level for level in ("low risk", "medium risk", "high risk")
+            if level not in panel_text_lower
+        ]
+        assert not missing, f"Missing risk levels: {missing}"
 
-    def test_risk_thresholds_documented(self, risk_tab: Page):
+    def test_risk_thresholds_documented(self, risk_container_present: bool):
         """Test risk thresholds are shown or documented."""
         # Page should load successfully
-        assert risk_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        assert risk_container_present
 
 
 class TestRiskVisualization:
     """Test risk visualization elements."""
 
-    def test_risk_data_visualized(self, risk_tab: Page):
+    def test_risk_data_visualized(self, page_text_lower: str):
         """Test risk data is visualized."""
         # Look for charts or tables
-        page_text = risk_tab.content()
-        assert len(page_text) > 200
+        assert len(page_text_lower) > 200
 
-    def test_risk_breakdown_shown(self, risk_tab: Page):
+    def test_risk_breakdown_shown(self, page_terms: Set[str]):
         """Test risk score breakdown is shown."""
-        page_text = risk_tab.content().lower()
         # Should show some breakdown
-        assert "risk" in page_text
+        assert "risk" in page_terms
 
 
 class TestRiskFiltering:
     """Test filtering trials by risk."""
 
-    def test_filter_by_risk_category(self, risk_tab: Page):
+    def test_filter_by_risk_category(self, risk_container_present: bool):
         """Test filtering by risk category."""
         # Page should render
-        assert risk_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        assert risk_container_present
 
-    def test_sort_by_risk_score(self, risk_tab: Page):
+    def test_sort_by_risk_score(self, risk_container_present: bool):
         """Test sorting by risk score."""
         # Page should have sortable content
-        assert risk_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        assert risk_container_present
 
 
 class TestRiskExport:
     """Test exporting risk data."""
 
-    def test_risk_export_available(self, risk_tab: Page):
+    def test_risk_export_available(self, page_terms: Set[str], page_text_lower: str):
         """Test risk data export is available."""
-        page_text = risk_tab.content().lower()
         # May have export option
-        assert "risk" in page_text or len(page_text) > 100
+        assert "risk" in page_terms or len(page_text_lower) > 100
 
 
 pytestmark = pytest.mark.ui
@@ -6,97 +6,89 @@ Tests configuration options, preferences, and settings persistence.
 import pytest
 from playwright.sync_api import Page, expect
 
-BASE_URL = "http://localhost:8501"
+from tests.ui_helpers import APP_CONTAINER, tab_button
 
 
-@pytest.fixture(scope="function")
-def settings_tab(page: Page):
-    """Navigate to Settings tab."""
-    page.goto(BASE_URL)
-    page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-    page.wait_for_timeout(2000)
+@pytest.fixture(scope="module")
+def settings_tab(open_tab) -> Page:
+    """Navigate to Settings tab once for the module; its tests only read the page."""
+    return open_tab("Settings")
 
-    # Click Settings tab
-    settings_btn = page.locator('button:has-text("Settings")')
-    if settings_btn.count() > 0:
-        settings_btn.first.click()
-        page.wait_for_timeout(2000)
 
-    return page
+@pytest.fixture(scope="module")
+def settings_container_present(settings_tab: Page) -> bool:
+    """Whether the Settings tab rendered the app container, checked once for the module."""
+    return settings_tab.locator(APP_CONTAINER).count() > 0
+
+
+@pytest.fixture(scope="module")
+def page_text_lower(settings_tab: Page) -> str:
+    """Lowercased HTML of the Settings tab, serialized once for the module."""
+    return settings_tab.content().lower()
 
 
 class TestSettingsTabNavigation:
     """Test Settings tab navigation."""
 
-    def test_settings_tab_exists(self, page: Page):
+    def test_settings_tab_exists(self, settings_tab: Page):
         """Test Settings tab exists."""
-        page.goto(BASE_URL)
-        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=10000)
-        page.wait_for_timeout(2000)
-
-        settings_btn = page.locator('button:has-text("Settings")')
-        expect(settings_btn.first).to_be_visible()
+        expect(tab_button(settings_tab, "Settings")).to_be_visible()
 
-    def test_settings_tab_loads(self, settings_tab: Page):
+    def test_settings_tab_loads(self, page_text_lower: str):
         """Test Settings tab loads."""
-        page_text = settings_tab.content().lower()
-        assert "setting" in page_text or "preference" in page_text or "config" in page_text
+        assert "setting" in page_text_lower or "preference" in page_text_lower or "config" in page_text_lower
 
 
 class TestEmailAlerts:
     """Test email alert configuration."""
 
-    def test_email_alerts_section(self, settings_tab: Page):
+    def test_email_alerts_section(self, page_text_lower: str):
         """Test email alerts section exists."""
-        page_text = settings_tab.content().lower()
         # May have email or notification settings
-        assert len(page_text) > 50
+        assert len(page_text_lower) > 50
 
-    def test_alert_type_selection(self, settings_tab: Page):
+    def test_alert_type_selection(self, settings_container_present: bool):
         """Test alert type selection."""
         # Page should render settings
-        assert settings_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        assert settings_container_present
 
 
 class TestNotificationPreferences:
     """Test notification preferences."""
 
-    def test_notification_settings(self, settings_tab: Page):
+    def test_notification_settings(self, page_text_lower: str):
         """Test notification settings are available."""
-        page_text = settings_tab.content()
-        assert len(page_text) > 50
+        assert len(page_text_lower) > 50
 
 
 class TestDataPreferences:
     """Test data and display preferences."""
 
-    def test_distance_unit_preference(self, settings_tab: Page):
+    def test_distance_unit_preference(self, settings_container_present: bool):
         """Test distance unit preference."""
         # Settings page should load
-        assert settings_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        assert settings_container_present
 
-    def test_data_refresh_settings(self, settings_tab: Page):
+    def test_data_refresh_settings(self, page_text_lower: str):
         """Test data refresh settings."""
-        page_text = settings_tab.content()
-        assert len(page_text) > 50
+        assert len(page_text_lower) > 50
 
 
 class TestExportPreferences:
     """Test export format preferences."""
 
-    def test_export_format_options(self, settings_tab: Page):
+    def test_export_format_options(self, settings_container_present: bool):
         """Test export format preferences."""
         # Page should render
-        assert settings_tab.locator('[data-testid="stAppViewContainer"]').count() > 0
+        assert settings_container_present
 
 
 class TestSettingsPersistence:
     """Test settings persistence."""
 
-    def test_save_settings_button(self, settings_tab: Page):
+    def test_save_settings_button(self, page_text_lower: str):
         """Test save settings functionality."""
-        page_text = settings_tab.content()
-        assert len(page_text) > 50
+        assert len(page_text_lower) > 50
 
 
 pytestmark = pytest.mark.ui
@@ -0,0 +1,35 @@
+"""UI smoke tests for tab navigation.
+
+Loads the app once and checks that each tab can be found, opened and
+rendered, instead of starting a fresh page per tab.
+"""
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests.ui_helpers import APP_CONTAINER, open_app, tab_button, wait_ready
+
+
+@pytest.fixture(scope="module")
+def loaded_app(module_page: Page):
+    """Load the app once for every tab check in this module."""
+    open_app(module_page)
+    return module_page
+
+
+class TestTabNavigation:
+    """Test each tab exists and loads."""
+
+    @pytest.mark.parametrize("tab_name", ["Eligibility Explorer", "Explore", "Fetch Data"])
+    def test_tab_exists_and_loads(self, loaded_app: Page, tab_name: str):
+        """Test the tab is visible, clickable and renders the app."""
+        tab = tab_button(loaded_app, tab_name)
+        expect(tab).to_be_visible()
+
+        tab.click()
+        wait_ready(loaded_app)
+        expect(loaded_app.locator(APP_CONTAINER)).to_be_visible()
+
+
+# Mark all tests as UI tests
+pytestmark = pytest.mark.ui
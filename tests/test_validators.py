@@ -105,6 +105,16 @@ class TestSanitizeTextInput:
         result = sanitize_text_input(long_text, max_length=100)
         assert len(result) <= 100
 
+    def test_sanitize_length_limit_after_removal(self):
+        """Test removed tags and keywords don't count towards the length limit."""
+        result = sanitize_text_input("<b>lung</b> DROP " * 500, max_length=100)
+        assert result == ("lung  " * 17).strip()
+
+    def test_sanitize_long_tag_past_length_limit(self):
+        """Test a tag running past the length limit is still removed."""
+        result = sanitize_text_input("<" + "a" * 1000 + ">lung cancer", max_length=100)
+        assert result == "lung cancer"
+
     def test_sanitize_empty_string(self):
         """Test empty string."""
         result = sanitize_text_input("")
@@ -0,0 +1,166 @@
+"""Shared helpers for the Playwright UI tests."""
+
+import weakref
+from typing import List
+
+from playwright.sync_api import Locator, Page, expect
+
+APP_CONTAINER = '[data-testid="stAppViewContainer"]'
+
+# Shown in the top right while Streamlit is rerunning the script
+STATUS_WIDGET = '[data-testid="stStatusWidget"]'
+
+# Accessible name of each of the app's tabs, in the order they are shown.
+# Streamlit renders tabs with role="tab", so they are looked up with
+# get_by_role, which matches a substring of the name by default.
+TABS = {
+    name: name
+    for name in [
+        "Patient Matching",
+        "Explore",
+        "Eligibility Explorer",
+        "Risk Analysis",
+        "Compare Trials",
+        "My Referrals",
+        "Settings",
+        "Fetch Data"
+    ]
+}
+# Plain "Explore" would also match the Eligibility Explorer tab
+TABS["Explore"] = "📊 Explore"
+
+# Position of each tab in the app's tab bar
+TAB_INDEX = {name: index for index, name in enumerate(TABS)}
+
+# Tab bar locator for each page, built once and reused for every switch
+_TAB_BARS = weakref.WeakKeyDictionary()
+
+
+def tab_button(page: Page, name: str) -> Locator:
+    """Get a tab of the app's main tab bar by position.
+
+    Args:
+        page: Playwright page showing the app
+        name: Tab name, one of the TABS keys
+
+    Returns:
+        Locator for the tab
+    """
+    tabs = _TAB_BARS.get(page)
+    if tabs is None:
+        tabs = _TAB_BARS[page] = page.locator('[data-testid="stTabs"]').first.get_by_role("tab")
+    return tabs.nth(TAB_INDEX[name])
+
+
+def tab_panel(page: Page, name: str) -> Locator:
+    """Get the content panel of one of the app's main tabs.
+
+    Streamlit mounts every tab's panel at once, so a page-wide lookup also
+    finds same-named widgets on other tabs, such as the Age and Cancer Type
+    inputs in the Settings alert form. Look widgets up within the panel.
+
+    Args:
+        page: Playwright page showing the app
+        name: Tab name, one of the TABS keys
+
+    Returns:
+        Locator for the tab's panel
+    """
+    return page.get_by_test_id("stTabPanel").nth(TAB_INDEX[name])
+
+
+def wait_ready(page: Page, timeout: float = 10000):
+    """Wait until the app has rendered and Streamlit is idle.
+
+    Replaces fixed sleeps after navigation and clicks: returns as soon as
+    the network settles and the running indicator is gone.
+
+    Args:
+        page: Playwright page showing the app
+        timeout: Maximum time to wait in milliseconds
+    """
+    page.wait_for_load_state("networkidle", timeout=timeout)
+    expect(page.get_by_test_id("stAppViewContainer")).to_be_attached(timeout=timeout)
+    expect(page.locator(STATUS_WIDGET)).to_have_count(0, timeout=timeout)
+
+
+def open_app(page: Page, path: str = "/", timeout: float = 10000):
+    """Navigate to the app and wait until it has rendered.
+
+    Returns once the response starts arriving instead of waiting for the
+    load event, then waits on the app container and Streamlit being idle,
+    since Streamlit draws the page over its WebSocket after load anyway.
+
+    Args:
+        page: Playwright page
+        path: Path relative to the base URL, including any query string
+        timeout: Maximum time to wait in milliseconds
+    """
+    page.goto(path, wait_until="commit")
+    expect(page.get_by_test_id("stAppViewContainer")).to_be_visible(timeout=timeout)
+    expect(page.locator(STATUS_WIDGET)).to_have_count(0, timeout=timeout)
+
+
+def submit_text(page: Page, field: Locator, text: str, timeout: float = 10000):
+    """Type into a Streamlit text input and wait for the rerun it triggers.
+
+    Streamlit only sends the new value on Enter or blur, so pressing Enter
+    starts the rerun straight away instead of waiting on a fixed delay.
+
+    Args:
+        page: Playwright page showing the app
+        field: Text input to fill
+        text: Value to enter
+        timeout: Maximum time to wait in milliseconds
+    """
+    field.fill(text)
+    field.press("Enter")
+    wait_ready(page, timeout)
+
+
+def click_tab(page: Page, name: str) -> bool:
+    """Switch to a tab if the app shows it.
+
+    Streamlit draws every tab's content up front and switches tabs in the
+    browser without a rerun, so the switch is done once the tab reports
+    itself selected; there is no network activity to wait out.
+
+    Args:
+        page: Playwright page showing the app
+        name: Tab name, one of the TABS keys
+
+    Returns:
+        True if the tab was found and clicked
+    """
+    tab_btn = tab_button(page, name)
+    if tab_btn.count() == 0:
+        return False
+    tab_btn.click()
+    expect(tab_btn).to_have_attribute("aria-selected", "true")
+    return True
+
+
+# Runs in the browser: names whose text no visible element contains
+_MISSING_TEXT_JS = """(names) => {
+    const texts = Array.from(
+        document.querySelectorAll('[data-testid="stAppViewContainer"] *'),
+        (el) => el.checkVisibility() ? el.textContent.toLowerCase() : ""
+    );
+    return names.filter((name) => !texts.some((text) => text.includes(name.toLowerCase())));
+}"""
+
+
+def missing_text(page: Page, names: List[str]) -> List[str]:
+    """Find which of several texts the app does not show.
+
+    Checks every name in one browser-side pass, so asserting that a group
+    of labels is visible costs one round trip instead of one per label.
+
+    Args:
+        page: Playwright page showing the app
+        names: Texts to look for, matched case-insensitively
+
+    Returns:
+        The names not found in any visible element
+    """
+    return page.evaluate(_MISSING_TEXT_JS, names)
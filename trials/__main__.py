@@ -1,42 +1,36 @@
 """CLI entry point for trials package."""
 
+import importlib
+import importlib.util
 import sys
 
+# Commands that run the main() of the trials submodule of the same name
+PIPELINE_COMMANDS = ("fetch", "normalize", "eligibility", "features", "cluster", "risk")
+
+COMMANDS_HELP = "Commands: " + ", ".join(PIPELINE_COMMANDS + ("app",))
+
 if __name__ == "__main__":
     # Determine which module to run based on first argument
     if len(sys.argv) < 2:
         print("Usage: python -m trials <command>")
-        print("Commands: fetch, normalize, eligibility, features, cluster, risk, app")
+        print(COMMANDS_HELP)
         sys.exit(1)
 
     command = sys.argv[1]
     # Remove the command from argv so submodules see correct args
     sys.argv = [sys.argv[0]] + sys.argv[2:]
 
-    if command == "fetch":
-        from trials.fetch import main
-        main()
-    elif command == "normalize":
-        from trials.normalize import main
-        main()
-    elif command == "eligibility":
-        from trials.eligibility import main
-        main()
-    elif command == "features":
-        from trials.features import main
-        main()
-    elif command == "cluster":
-        from trials.cluster import main
-        main()
-    elif command == "risk":
-        from trials.risk import main
-        main()
+    if command in PIPELINE_COMMANDS:
+        # Only the chosen submodule and its own dependencies are imported
+        importlib.import_module(f"trials.{command}").main()
     elif command == "app":
         import streamlit.web.cli as stcli
-        from trials import app
-        sys.argv = ["streamlit", "run", app.__file__]
+        # Streamlit runs the app script itself, so only its path is needed here;
+        # importing it would load the whole app a second time
+        app_path = importlib.util.find_spec("trials.app").origin
+        sys.argv = ["streamlit", "run", app_path]
         sys.exit(stcli.main())
     else:
         print(f"Unknown command: {command}")
-        print("Commands: fetch, normalize, eligibility, features, cluster, risk, app")
+        print(COMMANDS_HELP)
         sys.exit(1)
@@ -49,6 +49,39 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return distance
 
 
+def required_biomarkers(requirements: dict) -> frozenset:
+    """Get the patient biomarker keys a trial's biomarker requirements call for.
+
+    Args:
+        requirements: Trial biomarker_requirements dictionary
+
+    Returns:
+        Frozenset of biomarker keys (e.g. "egfr", "her2") the trial requires
+    """
+    required = set()
+    if requirements.get('egfr_mutation'):
+        required.add("egfr")
+    if requirements.get('alk_rearrangement'):
+        required.add("alk")
+    if requirements.get('ros1_rearrangement'):
+        required.add("ros1")
+    if requirements.get('her2_status') == 'Positive':
+        required.add("her2")
+    if requirements.get('brca_mutation'):
+        required.add("brca")
+    if requirements.get('msi_status'):
+        required.add("msi")
+    if requirements.get('mmr_status'):
+        required.add("mmr")
+    if requirements.get('idh_mutation'):
+        required.add("idh")
+    if requirements.get('mgmt_methylated'):
+        required.add("mgmt")
+    if requirements.get('pdl1_required') or requirements.get('pdl1_cutoff'):
+        required.add("pdl1")
+    return frozenset(required)
+
+
 def geocode_location(city: str = None, state: str = None, zip_code: str = None) -> tuple:
     """Simple geocoding using approximate US state/city centers.
 
@@ -602,6 +635,7 @@ def main() -> None:
                     patient_biomarkers.append("idh")
                 if has_mgmt:
                     patient_biomarkers.append("mgmt")
+                patient_biomarker_set = frozenset(patient_biomarkers)
 
                 # Auto-exclude trials based on patient conditions, ECOG, biomarkers, and prior lines
                 excluded_count = 0
@@ -669,48 +703,17 @@ def main() -> None:
                                     trial_biomarkers = elig_row.get("biomarker_requirements")
                                     if trial_biomarkers and isinstance(trial_biomarkers, dict):
                                         # Check if trial requires a biomarker the patient doesn't have
-                                        biomarker_mismatch = False
-
-                                        # EGFR check
-                                        if trial_biomarkers.get('egfr_mutation') and not has_egfr:
-                                            biomarker_mismatch = True
-                                        # ALK check
-                                        if trial_biomarkers.get('alk_rearrangement') and not has_alk:
-                                            biomarker_mismatch = True
-                                        # ROS1 check
-                                        if trial_biomarkers.get('ros1_rearrangement') and not has_ros1:
-                                            biomarker_mismatch = True
-                                        # HER2 check
-                                        if trial_biomarkers.get('her2_status') == 'Positive' and not has_her2:
-                                            biomarker_mismatch = True
-                                        # BRCA check
-                                        if trial_biomarkers.get('brca_mutation') and not has_brca:
-                                            biomarker_mismatch = True
-                                        # MSI check
-                                        if trial_biomarkers.get('msi_status') and not has_msi_h:
-                                            biomarker_mismatch = True
-                                        # MMR check
-                                        if trial_biomarkers.get('mmr_status') and not has_mmr_def:
-                                            biomarker_mismatch = True
-                                        # IDH check
-                                        if trial_biomarkers.get('idh_mutation') and not has_idh:
-                                            biomarker_mismatch = True
-                                        # MGMT check
-                                        if trial_biomarkers.get('mgmt_methylated') and not has_mgmt:
-                                            biomarker_mismatch = True
-                                        # PD-L1 check
-                                        if (trial_biomarkers.get('pdl1_required') or trial_biomarkers.get('pdl1_cutoff')) and not has_pdl1:
-                                            biomarker_mismatch = True
-
-                                        if biomarker_mismatch:
+                                        missing_biomarkers = required_biomarkers(trial_biomarkers) - patient_biomarker_set
+
+                                        if missing_biomarkers:
                                             trials_to_exclude.append(trial_id)
                                             # Track which biomarker caused mismatch
                                             mismatched = []
-                                            if trial_biomarkers.get('egfr_mutation') and not has_egfr:
+                                            if "egfr" in missing_biomarkers:
                                                 mismatched.append("EGFR")
-                                            if trial_biomarkers.get('her2_status') == 'Positive' and not has_her2:
+                                            if "her2" in missing_biomarkers:
                                                 mismatched.append("HER2+")
-                                            if trial_biomarkers.get('alk_rearrangement') and not has_alk:
+                                            if "alk" in missing_biomarkers:
                                                 mismatched.append("ALK")
                                             exclusion_reasons[trial_id] = f"Requires {', '.join(mismatched)} biomarker(s)"
                                             continue
@@ -887,7 +890,7 @@ def main() -> None:
 
                     if excluded_phases:
                         for phase_name in excluded_phases:
-                            phase_trials = trials_df[trials_df["phase"].str.contains(phase_name, case=False, na=False)]
+                            phase_trials = trials_df[trials_df["phase"].str.contains(phase_name, case=False, na=False, regex=False)]
                             if len(phase_trials) > 0:
                                 suggestions.append(f"- **{len(phase_trials)} trials** if you include {phase_name}")
 
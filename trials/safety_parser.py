@@ -1,7 +1,17 @@
 """Parse safety and toxicity data from clinical trials."""
 
 import re
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Display order, headers and indicators for format_safety_display
+_SECTIONS = (
+    ("dose_limiting_toxicities", "Dose-Limiting Toxicities", "⚠️"),
+    ("grade_3_4_events", "Grade 3-4 Events", "🔴"),
+    ("common_aes", "Common AEs", "💊"),
+    ("safety_monitoring", "Monitoring Required", "🔬"),
+)
+_SECTION_TEMPLATE = "**{emoji} {label}:** {items}"
 
 
 def parse_adverse_events(eligibility_text: Optional[str], description: Optional[str] = None) -> Dict:
@@ -14,6 +24,17 @@ def parse_adverse_events(eligibility_text: Optional[str], description: Optional[
     Returns:
         Dictionary with toxicity information
     """
+    # Trials often share boilerplate safety language, so parse results are
+    # memoized; callers get fresh lists so the cached copy can't be mutated.
+    cached = _parse_adverse_events_cached(eligibility_text, description)
+    return {key: list(events) for key, events in cached}
+
+
+@lru_cache(maxsize=4096)
+def _parse_adverse_events_cached(
+    eligibility_text: Optional[str], description: Optional[str]
+) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Uncached parser behind parse_adverse_events, returning an immutable result."""
     result = {
         "common_aes": [],
         "dose_limiting_toxicities": [],
@@ -22,7 +43,7 @@ def parse_adverse_events(eligibility_text: Optional[str], description: Optional[
     }
 
     if not eligibility_text and not description:
-        return result
+        return tuple((key, ()) for key in result)
 
     # Combine texts
     full_text = ""
@@ -105,7 +126,7 @@ def parse_adverse_events(eligibility_text: Optional[str], description: Optional[
     result["grade_3_4_events"] = list(set(result["grade_3_4_events"]))[:10]
     result["safety_monitoring"] = list(set(result["safety_monitoring"]))
 
-    return result
+    return tuple((key, tuple(events)) for key, events in result.items())
 
 
 def format_safety_display(safety_data: Dict) -> str:
@@ -117,23 +138,15 @@ def format_safety_display(safety_data: Dict) -> str:
     Returns:
         Formatted HTML string for display
     """
-    sections = []
-
-    if safety_data.get("dose_limiting_toxicities"):
-        dlts = ", ".join(safety_data["dose_limiting_toxicities"])
-        sections.append(f"**⚠️ Dose-Limiting Toxicities:** {dlts}")
-
-    if safety_data.get("grade_3_4_events"):
-        grade34 = ", ".join(safety_data["grade_3_4_events"])
-        sections.append(f"**🔴 Grade 3-4 Events:** {grade34}")
-
-    if safety_data.get("common_aes"):
-        common = ", ".join(safety_data["common_aes"])
-        sections.append(f"**💊 Common AEs:** {common}")
-
-    if safety_data.get("safety_monitoring"):
-        monitoring = ", ".join(safety_data["safety_monitoring"])
-        sections.append(f"**🔬 Monitoring Required:** {monitoring}")
+    sections = [
+        _SECTION_TEMPLATE.format_map({
+            "emoji": emoji,
+            "label": label,
+            "items": ", ".join(safety_data[key]),
+        })
+        for key, label, emoji in _SECTIONS
+        if safety_data.get(key)
+    ]
 
     if not sections:
         return "ℹ️ Safety data not available in trial documentation"
@@ -1,9 +1,44 @@
 """Patient search profile saving and management."""
 
 import json
+import re
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+_PROFILE_ID_RE = re.compile(r"PROF(\d+)")
+_SEARCH_ID_RE = re.compile(r"SEARCH(\d+)")
+
+
+def _save_json(path: Path, obj: Any, pretty: bool = False):
+    """Write obj to path as JSON.
+
+    Output is compact by default since these files are rewritten on every
+    change; pass pretty=True for human-readable output when debugging.
+    """
+    with open(path, 'w') as f:
+        if pretty:
+            json.dump(obj, f, indent=2)
+        else:
+            json.dump(obj, f, separators=(",", ":"))
+
+
+def _next_number(records: List[Dict], key: str, id_re: re.Pattern) -> int:
+    """Get the number to give the next record's ID.
+
+    IDs that don't match id_re, such as hand-edited ones, are skipped
+    rather than making the whole file unreadable.
+
+    Args:
+        records: Saved records
+        key: Field holding each record's ID
+        id_re: Pattern for a well-formed ID, capturing its number
+
+    Returns:
+        One more than the highest number among well-formed IDs
+    """
+    matches = (id_re.fullmatch(str(record.get(key, ""))) for record in records)
+    return 1 + max((int(match.group(1)) for match in matches if match), default=0)
 
 
 class SearchProfileManager:
@@ -19,6 +54,7 @@ class SearchProfileManager:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.profiles_file = self.data_dir / "search_profiles.json"
         self.profiles = self._load_profiles()
+        self._next_id = _next_number(self.profiles, "profile_id", _PROFILE_ID_RE)
 
     def _load_profiles(self) -> List[Dict]:
         """Load existing profiles from file."""
@@ -32,8 +68,7 @@ class SearchProfileManager:
 
     def _save_profiles(self):
         """Save profiles to file."""
-        with open(self.profiles_file, 'w') as f:
-            json.dump(self.profiles, f, indent=2)
+        _save_json(self.profiles_file, self.profiles)
 
     def save_profile(
         self,
@@ -51,7 +86,8 @@ class SearchProfileManager:
         Returns:
             Profile ID
         """
-        profile_id = f"PROF{len(self.profiles) + 1:04d}"
+        profile_id = f"PROF{self._next_id:04d}"
+        self._next_id += 1
 
         profile = {
             "profile_id": profile_id,
@@ -138,6 +174,7 @@ class SearchHistoryManager:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.history_file = self.data_dir / "search_history.json"
         self.history = self._load_history()
+        self._next_id = _next_number(self.history, "search_id", _SEARCH_ID_RE)
 
     def _load_history(self) -> List[Dict]:
         """Load existing history from file."""
@@ -151,8 +188,7 @@ class SearchHistoryManager:
 
     def _save_history(self):
         """Save history to file."""
-        with open(self.history_file, 'w') as f:
-            json.dump(self.history, f, indent=2)
+        _save_json(self.history_file, self.history)
 
     def add_search(self, criteria: Dict, results_count: int):
         """Add a search to history.
@@ -162,12 +198,13 @@ class SearchHistoryManager:
             results_count: Number of results found
         """
         search = {
-            "search_id": f"SEARCH{len(self.history) + 1:05d}",
+            "search_id": f"SEARCH{self._next_id:05d}",
             "criteria": criteria,
             "results_count": results_count,
             "timestamp": datetime.now().isoformat()
         }
 
+        self._next_id += 1
         self.history.insert(0, search)  # Add to beginning
 
         # Keep only last 50 searches
@@ -188,4 +225,5 @@ class SearchHistoryManager:
     def clear_history(self):
         """Clear all search history."""
         self.history = []
+        self._next_id = 1
         self._save_history()
@@ -1,14 +1,134 @@
 """Similar patients analysis for clinical trial matching."""
 
 import json
+import os
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+# Age range for each year of age 0-120, anything older clamps to the last entry
+_AGE_BUCKETS = (
+    ("18-39",) * 40 + ("40-49",) * 10 + ("50-59",) * 10 + ("60-69",) * 10 + ("70+",) * 51
+)
+
+_ENROLLMENTS_NAME = "enrollments_anonymized.json"
+# Each compaction starts a new log, numbered by the generation recorded in
+# the enrollments file, so a log that was already folded in is never replayed
+_ENROLLMENTS_LOG_NAME = "enrollments_anonymized.{}.jsonl"
+
+_NO_DATA_DISPLAY = """### 👥 Similar Patients
+
+ℹ️ No similar patient data available yet.
+
+As more patients use this system, we'll show you anonymized data about patients with similar profiles."""
+
+# Appended records are folded into the main enrollments file once this many pile up
+COMPACT_EVERY = 100
+
+
+def _dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _loads(raw: bytes):
+    """Deserialize JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _category_codes(column: pd.Series, values: List) -> np.ndarray:
+    """Map values to the category codes of a categorical column.
+
+    None maps to -1, the code of missing entries, so a missing value still
+    matches a missing entry. Values the column never holds map to -2, which
+    matches nothing.
+
+    Args:
+        column: Categorical column
+        values: Values to look up
+
+    Returns:
+        Integer array of codes, one per value
+    """
+    codes = column.cat.categories.get_indexer(values)
+    codes[codes == -1] = -2
+    codes[np.array([value is None for value in values], dtype=bool)] = -1
+    return codes
+
+
+@dataclass(slots=True, frozen=True)
+class Enrollment:
+    """A single anonymized enrollment outcome."""
+
+    nct_id: str
+    outcome: str
+    timestamp: str
+    age_range: Optional[str] = None
+    cancer_type: Optional[str] = None
+    stage: Optional[str] = None
+    prior_lines: Optional[int] = None
+    ecog: Optional[int] = None
+    biomarkers: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Enrollment":
+        """Build an enrollment from its persisted form."""
+        profile = data.get("profile", {})
+        return cls(
+            nct_id=data["nct_id"],
+            outcome=data["outcome"],
+            timestamp=data.get("timestamp", ""),
+            age_range=profile.get("age_range"),
+            cancer_type=profile.get("cancer_type"),
+            stage=profile.get("stage"),
+            prior_lines=profile.get("prior_lines"),
+            ecog=profile.get("ecog"),
+            biomarkers=profile.get("biomarkers", []),
+        )
+
+    def to_dict(self) -> Dict:
+        """Convert to the persisted form."""
+        return {
+            "nct_id": self.nct_id,
+            "profile": {
+                "age_range": self.age_range,
+                "cancer_type": self.cancer_type,
+                "stage": self.stage,
+                "prior_lines": self.prior_lines,
+                "ecog": self.ecog,
+                "biomarkers": self.biomarkers
+            },
+            "outcome": self.outcome,
+            "timestamp": self.timestamp
+        }
+
 
 class SimilarPatientsAnalyzer:
     """Analyze similar patient enrollment patterns."""
 
+    __slots__ = (
+        "data_dir",
+        "enrollments_file",
+        "log_file",
+        "enrollments",
+        "_generation",
+        "_pending",
+        "_table",
+        "_enrolled_counts",
+    )
+
     def __init__(self, data_dir: str = "data/patient_analytics"):
         """Initialize analyzer.
 
@@ -17,23 +137,97 @@ class SimilarPatientsAnalyzer:
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.enrollments_file = self.data_dir / "enrollments_anonymized.json"
+        self.enrollments_file = self.data_dir / _ENROLLMENTS_NAME
+        self._generation = 0
+        self._pending = 0
         self.enrollments = self._load_enrollments()
+        self._table = None
+        self._enrolled_counts = Counter(
+            e.nct_id for e in self.enrollments if e.outcome == "enrolled"
+        )
+
+    def _load_enrollments(self) -> List[Enrollment]:
+        """Load anonymized enrollment data.
 
-    def _load_enrollments(self) -> List[Dict]:
-        """Load anonymized enrollment data."""
+        Reads the consolidated enrollments file, then any records appended
+        to the log since it was last compacted. Files written before logs
+        were numbered hold a bare JSON array and count as generation 0.
+        """
+        enrollments = []
         if self.enrollments_file.exists():
             try:
-                with open(self.enrollments_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+                raw = self.enrollments_file.read_bytes()
+                # Anything that isn't a JSON object or array is corrupt; skip the parser
+                if raw.lstrip()[:1] in (b"{", b"["):
+                    data = _loads(raw)
+                    if isinstance(data, dict):
+                        self._generation = data["generation"]
+                        data = data["enrollments"]
+                    enrollments = [Enrollment.from_dict(d) for d in data]
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                enrollments = []
+                self._generation = 0
+
+        self.log_file = self.data_dir / _ENROLLMENTS_LOG_NAME.format(self._generation)
+        if self.log_file.exists():
+            lines = [line for line in self.log_file.read_bytes().split(b"\n") if line]
+            try:
+                # Decode the whole log as one array rather than line by line
+                records = _loads(b"[" + b",".join(lines) + b"]")
+            except ValueError:
+                # A torn write left a bad line; fall back to skipping it
+                records = []
+                for line in lines:
+                    try:
+                        records.append(_loads(line))
+                    except ValueError:
+                        continue
+            for record in records:
+                try:
+                    enrollments.append(Enrollment.from_dict(record))
+                except (KeyError, TypeError, AttributeError):
+                    # Not a record, or one missing fields; skip it like a torn line
+                    continue
+            self._pending = len(records)
+
+        return enrollments
+
+    def _save_enrollments(self, generation: int):
+        """Save enrollment data.
+
+        Writes to a temporary file and renames it over the enrollments file
+        so a crash mid-write never leaves a truncated file behind.
 
-    def _save_enrollments(self):
-        """Save enrollment data."""
-        with open(self.enrollments_file, 'w') as f:
-            json.dump(self.enrollments, f, indent=2)
+        Args:
+            generation: Number of the log that records appended after this
+                snapshot go to
+        """
+        tmp_file = self.enrollments_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(_dumps({
+            "generation": generation,
+            "enrollments": [e.to_dict() for e in self.enrollments]
+        }))
+        os.replace(tmp_file, self.enrollments_file)
+
+    def _append_enrollment(self, record: Enrollment):
+        """Append a single enrollment record to the log."""
+        with open(self.log_file, 'ab') as f:
+            f.write(_dumps(record.to_dict()) + b"\n")
+        self._pending += 1
+
+    def compact(self):
+        """Fold the append log into the consolidated enrollments file.
+
+        The snapshot moves on to a new log generation before the old log is
+        deleted, so a crash in between leaves a stale log that is ignored
+        rather than replayed on top of records it already holds.
+        """
+        self._save_enrollments(self._generation + 1)
+        self._generation += 1
+        old_log = self.log_file
+        self.log_file = self.data_dir / _ENROLLMENTS_LOG_NAME.format(self._generation)
+        old_log.unlink(missing_ok=True)
+        self._pending = 0
 
     def record_enrollment(
         self,
@@ -48,22 +242,25 @@ class SimilarPatientsAnalyzer:
             patient_profile: Anonymized patient characteristics
             outcome: 'enrolled', 'screen_failed', 'declined'
         """
-        record = {
-            "nct_id": nct_id,
-            "profile": {
-                "age_range": self._bucket_age(patient_profile.get("age")),
-                "cancer_type": patient_profile.get("cancer_type"),
-                "stage": patient_profile.get("stage"),
-                "prior_lines": patient_profile.get("prior_lines"),
-                "ecog": patient_profile.get("ecog"),
-                "biomarkers": patient_profile.get("biomarkers", [])
-            },
-            "outcome": outcome,
-            "timestamp": pd.Timestamp.now().isoformat()
-        }
+        record = Enrollment(
+            nct_id=nct_id,
+            outcome=outcome,
+            timestamp=pd.Timestamp.now().isoformat(),
+            age_range=self._bucket_age(patient_profile.get("age")),
+            cancer_type=patient_profile.get("cancer_type"),
+            stage=patient_profile.get("stage"),
+            prior_lines=patient_profile.get("prior_lines"),
+            ecog=patient_profile.get("ecog"),
+            biomarkers=patient_profile.get("biomarkers", [])
+        )
 
         self.enrollments.append(record)
-        self._save_enrollments()
+        self._table = None
+        if outcome == "enrolled":
+            self._enrolled_counts[nct_id] += 1
+        self._append_enrollment(record)
+        if self._pending >= COMPACT_EVERY:
+            self.compact()
 
     def _bucket_age(self, age: Optional[int]) -> Optional[str]:
         """Convert age to range for privacy.
@@ -77,16 +274,27 @@ class SimilarPatientsAnalyzer:
         if age is None:
             return None
 
-        if age < 40:
-            return "18-39"
-        elif age < 50:
-            return "40-49"
-        elif age < 60:
-            return "50-59"
-        elif age < 70:
-            return "60-69"
-        else:
-            return "70+"
+        return _AGE_BUCKETS[min(max(int(age), 0), len(_AGE_BUCKETS) - 1)]
+
+    def _enrollment_table(self) -> pd.DataFrame:
+        """Get the fields used for matching as a columnar table.
+
+        Built lazily from the enrollment records and cached until the next
+        enrollment is recorded, so repeated queries scan a few typed columns
+        instead of walking the records one by one.
+        """
+        if self._table is None:
+            enrollments = self.enrollments
+            self._table = pd.DataFrame({
+                "nct_id": pd.Categorical([e.nct_id for e in enrollments]),
+                "outcome": pd.Categorical([e.outcome for e in enrollments]),
+                "age_range": pd.Categorical([e.age_range for e in enrollments]),
+                "cancer_type": pd.Categorical(
+                    [(e.cancer_type or "").lower() for e in enrollments]
+                ),
+                "ecog": pd.Categorical([e.ecog for e in enrollments]),
+            })
+        return self._table
 
     def find_similar_patients(self, patient_profile: Dict, nct_id: Optional[str] = None) -> Dict:
         """Find similar patients and their outcomes.
@@ -98,53 +306,63 @@ class SimilarPatientsAnalyzer:
         Returns:
             Dictionary with similar patient statistics
         """
-        age_range = self._bucket_age(patient_profile.get("age"))
-        cancer_type = patient_profile.get("cancer_type", "").lower()
-        ecog = patient_profile.get("ecog")
-
-        # Filter for similar patients
-        similar = []
-        for enrollment in self.enrollments:
-            prof = enrollment["profile"]
-
-            # Match criteria
-            age_match = prof.get("age_range") == age_range
-            cancer_match = prof.get("cancer_type", "").lower() == cancer_type
-            ecog_match = prof.get("ecog") == ecog
-
-            # Require at least 2 of 3 matches
-            match_score = sum([age_match, cancer_match, ecog_match])
-
-            if match_score >= 2:
-                if nct_id is None or enrollment["nct_id"] == nct_id:
-                    similar.append(enrollment)
-
-        if not similar:
-            return {
-                "total_similar": 0,
-                "enrolled": 0,
-                "screen_failed": 0,
-                "declined": 0,
-                "success_rate": None
-            }
+        return self.find_similar_patients_batch([patient_profile], nct_id)[0]
 
-        # Calculate statistics
-        outcomes = [e["outcome"] for e in similar]
-        enrolled = outcomes.count("enrolled")
-        screen_failed = outcomes.count("screen_failed")
-        declined = outcomes.count("declined")
+    def find_similar_patients_batch(
+        self,
+        patient_profiles: List[Dict],
+        nct_id: Optional[str] = None
+    ) -> List[Dict]:
+        """Find similar patients and their outcomes for several profiles at once.
 
-        total = len(similar)
-        success_rate = (enrolled / total * 100) if total > 0 else None
+        Args:
+            patient_profiles: Profiles to analyze
+            nct_id: Optional specific trial to analyze
 
-        return {
-            "total_similar": total,
-            "enrolled": enrolled,
-            "screen_failed": screen_failed,
-            "declined": declined,
-            "success_rate": success_rate
+        Returns:
+            List of similar patient statistics, one per profile
+        """
+        targets = {
+            "age_range": [self._bucket_age(p.get("age")) for p in patient_profiles],
+            "cancer_type": [p.get("cancer_type", "").lower() for p in patient_profiles],
+            "ecog": [p.get("ecog") for p in patient_profiles],
         }
 
+        # Score every enrollment (rows) against every profile (columns) by
+        # comparing category codes, and require at least 2 of 3 matches
+        table = self._enrollment_table()
+        match_score = np.zeros((len(table), len(patient_profiles)), dtype=np.int8)
+        for column_name, values in targets.items():
+            column = table[column_name]
+            codes = column.cat.codes.to_numpy()
+            match_score += codes[:, None] == _category_codes(column, values)[None, :]
+        mask = match_score >= 2
+        if nct_id is not None:
+            trial_codes = table["nct_id"].cat.codes.to_numpy()
+            mask &= (trial_codes == _category_codes(table["nct_id"], [nct_id])[0])[:, None]
+
+        # Calculate statistics
+        outcomes = table["outcome"]
+        outcome_codes = outcomes.cat.codes.to_numpy()[:, None]
+        enrolled_code, screen_failed_code, declined_code = _category_codes(
+            outcomes, ["enrolled", "screen_failed", "declined"]
+        )
+        totals = mask.sum(axis=0).tolist()
+        enrolled = (mask & (outcome_codes == enrolled_code)).sum(axis=0).tolist()
+        screen_failed = (mask & (outcome_codes == screen_failed_code)).sum(axis=0).tolist()
+        declined = (mask & (outcome_codes == declined_code)).sum(axis=0).tolist()
+
+        return [
+            {
+                "total_similar": totals[i],
+                "enrolled": enrolled[i],
+                "screen_failed": screen_failed[i],
+                "declined": declined[i],
+                "success_rate": (enrolled[i] / totals[i] * 100) if totals[i] > 0 else None
+            }
+            for i in range(len(patient_profiles))
+        ]
+
     def get_alternative_trials(self, patient_profile: Dict, exclude_nct: Optional[str] = None) -> List[Dict]:
         """Get trials where similar patients enrolled.
 
@@ -155,20 +373,14 @@ class SimilarPatientsAnalyzer:
         Returns:
             List of trials with enrollment counts
         """
-        similar_analysis = self.find_similar_patients(patient_profile)
-
-        # Count enrollments by trial
-        trial_counts = {}
-        for enrollment in self.enrollments:
-            if enrollment["outcome"] == "enrolled":
-                nct = enrollment["nct_id"]
-                if nct != exclude_nct:
-                    trial_counts[nct] = trial_counts.get(nct, 0) + 1
+        # Enrollment counts by trial are kept up to date by record_enrollment
+        trial_counts = self._enrolled_counts.copy()
+        trial_counts.pop(exclude_nct, None)
 
         # Sort by count
-        sorted_trials = sorted(trial_counts.items(), key=lambda x: x[1], reverse=True)
+        sorted_trials = trial_counts.most_common(10)
 
-        return [{"nct_id": nct, "similar_enrolled": count} for nct, count in sorted_trials[:10]]
+        return [{"nct_id": nct, "similar_enrolled": count} for nct, count in sorted_trials]
 
 
 def format_similar_patients_display(stats: Dict) -> str:
@@ -181,30 +393,19 @@ def format_similar_patients_display(stats: Dict) -> str:
         Formatted markdown string
     """
     if stats["total_similar"] == 0:
-        return """### 👥 Similar Patients
-
-ℹ️ No similar patient data available yet.
-
-As more patients use this system, we'll show you anonymized data about patients with similar profiles."""
-
-    sections = []
-    sections.append("### 👥 Similar Patients")
-    sections.append("")
-    sections.append(f"**{stats['total_similar']}** patients with similar profiles have been referred")
-    sections.append("")
+        return _NO_DATA_DISPLAY
 
-    # Success rate
+    success_rate = ""
     if stats["success_rate"] is not None:
-        sections.append(f"**Success Rate:** {stats['success_rate']:.1f}% enrolled")
-        sections.append("")
-
-    # Breakdown
-    sections.append("**Outcomes:**")
-    sections.append(f"- ✅ Enrolled: {stats['enrolled']}")
-    sections.append(f"- ❌ Screen Failed: {stats['screen_failed']}")
-    sections.append(f"- ⏸️ Declined: {stats['declined']}")
-
-    sections.append("")
-    sections.append("_Note: Data is anonymized and aggregated for privacy_")
-
-    return "\n".join(sections)
+        success_rate = f"**Success Rate:** {stats['success_rate']:.1f}% enrolled\n\n"
+
+    return (
+        "### 👥 Similar Patients\n\n"
+        f"**{stats['total_similar']}** patients with similar profiles have been referred\n\n"
+        f"{success_rate}"
+        "**Outcomes:**\n"
+        f"- ✅ Enrolled: {stats['enrolled']}\n"
+        f"- ❌ Screen Failed: {stats['screen_failed']}\n"
+        f"- ⏸️ Declined: {stats['declined']}\n\n"
+        "_Note: Data is anonymized and aggregated for privacy_"
+    )
@@ -1,10 +1,159 @@
 """Trial notes and annotations system."""
 
+import atexit
 import json
+import os
+import re
+import sys
+import threading
+import time
+import weakref
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+# Seconds from the first unsaved change until the write; changes made in
+# that window share the write, and later ones schedule the next
+FLUSH_DELAY = 0.1
+
+# Note IDs as generated by add_note, capturing the note number
+_NOTE_ID_RE = re.compile(r"NOTE(\d+)")
+
+# Managers with possibly unsaved changes, flushed at interpreter exit
+_OPEN_MANAGERS = weakref.WeakSet()
+
+
+def _flush_open_managers():
+    """Write pending changes for every live manager."""
+    for manager in list(_OPEN_MANAGERS):
+        manager.save()
+
+
+atexit.register(_flush_open_managers)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _loads(raw: bytes):
+    """Deserialize JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _format_timestamp(timestamp) -> str:
+    """Convert a stored note timestamp to an ISO 8601 string.
+
+    Args:
+        timestamp: Nanoseconds since the epoch, or an ISO string from
+            files saved before timestamps were stored as integers
+
+    Returns:
+        Local-time ISO 8601 string
+    """
+    if isinstance(timestamp, str):
+        return timestamp
+    return datetime.fromtimestamp(timestamp / 1e9).isoformat()
+
+
+# Parsed notes by file path, reused while the file's mtime and size are unchanged
+_CACHE: Dict[str, tuple] = {}
+
+
+def _trials_from_file(data: Dict) -> Dict:
+    """Convert the notes file contents to in-memory trial records.
+
+    Notes are keyed by note ID, tags are held as a set, and each record
+    carries its next note number. Files from before tag groups were
+    introduced hold the trial records at the top level with inline tags.
+
+    Args:
+        data: Parsed notes file
+
+    Returns:
+        In-memory trial records
+    """
+    if "trials" in data and "tag_groups" in data:
+        tag_groups = data["tag_groups"]
+        records = data["trials"]
+    else:
+        tag_groups = []
+        records = data
+
+    trials = {}
+    for nct_id, trial in records.items():
+        trial = dict(trial)
+        tag_group = trial.pop("tag_group", None)
+        tags = tag_groups[tag_group] if tag_group is not None else trial.get("tags", [])
+        trial_notes = {note["note_id"]: note for note in trial.get("notes", [])}
+        next_note_id = trial.get("next_note_id")
+        if next_note_id is None:
+            # Files written before note counters were stored; IDs in any
+            # other form, such as hand-edited ones, can't clash and are skipped
+            matches = (_NOTE_ID_RE.fullmatch(str(n)) for n in trial_notes)
+            next_note_id = 1 + max((int(m.group(1)) for m in matches if m), default=0)
+        nct_id = sys.intern(nct_id)
+        trials[nct_id] = {
+            **trial,
+            "nct_id": nct_id,
+            "notes": trial_notes,
+            "tags": set(tags),
+            "next_note_id": next_note_id
+        }
+    return trials
+
+
+def _trials_to_file(notes: Dict) -> Dict:
+    """Convert in-memory trial records to the form saved on disk.
+
+    Trials often share the same tags, so each distinct tag set is written
+    once as a sorted list under "tag_groups" and trials refer to it by
+    index.
+
+    Args:
+        notes: In-memory trial records
+
+    Returns:
+        Notes file contents, with notes as a list in the order they were added
+    """
+    tag_groups = {}
+    trials = {}
+    for nct_id, trial in notes.items():
+        record = {key: value for key, value in trial.items() if key != "tags"}
+        record["notes"] = list(trial["notes"].values())
+        if trial["tags"]:
+            record["tag_group"] = tag_groups.setdefault(frozenset(trial["tags"]), len(tag_groups))
+        trials[nct_id] = record
+    return {"tag_groups": [sorted(tags) for tags in tag_groups], "trials": trials}
+
+
+def _copy_trials(notes: Dict) -> Dict:
+    """Copy in-memory trial records so one manager's edits never leak into another's.
+
+    Note entries themselves are never modified after creation, so they are
+    shared rather than copied.
+
+    Args:
+        notes: In-memory trial records
+
+    Returns:
+        Independent copies of the records
+    """
+    return {
+        nct_id: {**trial, "notes": dict(trial["notes"]), "tags": set(trial["tags"])}
+        for nct_id, trial in notes.items()
+    }
+
 
 class TrialNotesManager:
     """Manage personal notes and annotations for trials."""
@@ -18,22 +167,149 @@ class TrialNotesManager:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.notes_file = self.data_dir / "trial_notes.json"
+        self._unreadable = False
         self.notes = self._load_notes()
+        self._rebuild_indexes()
+        self._dirty = False
+        self._flush_timer = None
+        self._lock = threading.RLock()
+        _OPEN_MANAGERS.add(self)
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget all notes parsed so far, so the next load reads from disk."""
+        _CACHE.clear()
+
+    def __enter__(self):
+        """Use the manager as a context manager that saves on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Write pending changes when leaving the block."""
+        self.save()
 
     def _load_notes(self) -> Dict:
-        """Load existing notes from file."""
-        if self.notes_file.exists():
-            try:
-                with open(self.notes_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        """Load existing notes from file.
+
+        Reuses the notes parsed by an earlier manager when the file has not
+        changed since, so repeated construction skips re-reading it. A file
+        that can't be parsed loads as no notes, and is moved aside rather
+        than overwritten on the next save.
+        """
+        try:
+            stat = self.notes_file.stat()
+        except FileNotFoundError:
+            return {}
+
+        key = os.fspath(self.notes_file)
+        cached = _CACHE.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return _copy_trials(cached[2])
+
+        try:
+            notes = _trials_from_file(_loads(self.notes_file.read_bytes()))
+        except Exception:
+            self._unreadable = True
+            return {}
+        _CACHE[key] = (stat.st_mtime_ns, stat.st_size, notes)
+        return _copy_trials(notes)
+
+    def _get_or_create_trial(self, nct_id: str) -> Dict:
+        """Get the record for a trial, creating an empty one if needed.
+
+        Args:
+            nct_id: NCT ID of trial
+
+        Returns:
+            Trial record
+        """
+        trial = self.notes.get(nct_id)
+        if trial is None:
+            # Interned so the key, the record and the lookups share one string
+            nct_id = sys.intern(nct_id)
+            self._positions[nct_id] = len(self._positions)
+            trial = self.notes[nct_id] = {
+                "nct_id": nct_id,
+                "notes": {},
+                "starred": False,
+                "flagged": False,
+                "tags": set(),
+                "next_note_id": 1
+            }
+        return trial
+
+    def _rebuild_indexes(self):
+        """Rebuild the starred, flagged and tag lookups from the notes.
+
+        The lookups are sets of NCT IDs; each trial's position in the notes
+        is kept alongside so lookups are returned in the notes' order. Only
+        the notes are persisted.
+        """
+        self._positions = {}
+        self._starred = set()
+        self._flagged = set()
+        self._tag_index = {}
+        for position, (nct_id, data) in enumerate(self.notes.items()):
+            self._positions[nct_id] = position
+            if data.get("starred", False):
+                self._starred.add(nct_id)
+            if data.get("flagged", False):
+                self._flagged.add(nct_id)
+            for tag in data["tags"]:
+                self._tag_index.setdefault(tag, set()).add(nct_id)
+
+    def _in_notes_order(self, nct_ids) -> List[str]:
+        """Sort NCT IDs by when their trial was first added to the notes.
+
+        Args:
+            nct_ids: NCT IDs of trials in the notes
+
+        Returns:
+            List of NCT IDs
+        """
+        return sorted(nct_ids, key=self._positions.__getitem__)
 
     def _save_notes(self):
-        """Save notes to file."""
-        with open(self.notes_file, 'w') as f:
-            json.dump(self.notes, f, indent=2)
+        """Save notes to file.
+
+        Writes to a temporary file and renames it over the notes file so a
+        crash mid-write never leaves a truncated file behind.
+        """
+        if self._unreadable:
+            # Keep the file that failed to load for manual recovery
+            os.replace(self.notes_file, self.notes_file.with_suffix(".json.corrupt"))
+            self._unreadable = False
+
+        tmp_file = self.notes_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(_dumps(_trials_to_file(self.notes)))
+        os.replace(tmp_file, self.notes_file)
+
+        stat = self.notes_file.stat()
+        _CACHE[os.fspath(self.notes_file)] = (
+            stat.st_mtime_ns, stat.st_size, _copy_trials(self.notes)
+        )
+
+    def _mark_dirty(self):
+        """Record an unsaved change and schedule a write if none is pending.
+
+        The timer is not pushed back by further changes, so a long burst of
+        edits is written every FLUSH_DELAY seconds rather than once at the end.
+        """
+        self._dirty = True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(FLUSH_DELAY, self.save)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def save(self):
+        """Write any pending changes to disk now."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self._save_notes()
+                self._dirty = False
 
     def add_note(self, nct_id: str, note_text: str, note_type: str = "general"):
         """Add a note to a trial.
@@ -43,24 +319,20 @@ class TrialNotesManager:
             note_text: Note content
             note_type: Type of note (general, concern, positive, question)
         """
-        if nct_id not in self.notes:
-            self.notes[nct_id] = {
-                "nct_id": nct_id,
-                "notes": [],
-                "starred": False,
-                "flagged": False,
-                "tags": []
+        with self._lock:
+            trial = self._get_or_create_trial(nct_id)
+            note_number = trial["next_note_id"]
+            trial["next_note_id"] += 1
+
+            note_id = f"NOTE{note_number:04d}"
+            trial["notes"][note_id] = {
+                "note_id": note_id,
+                "text": note_text,
+                "type": note_type,
+                "timestamp": time.time_ns()
             }
 
-        note = {
-            "note_id": f"NOTE{len(self.notes[nct_id]['notes']) + 1:04d}",
-            "text": note_text,
-            "type": note_type,
-            "timestamp": datetime.now().isoformat()
-        }
-
-        self.notes[nct_id]["notes"].append(note)
-        self._save_notes()
+            self._mark_dirty()
 
     def get_notes(self, nct_id: str) -> Optional[Dict]:
         """Get all notes for a trial.
@@ -71,7 +343,17 @@ class TrialNotesManager:
         Returns:
             Notes dictionary or None if no notes
         """
-        return self.notes.get(nct_id)
+        trial = self.notes.get(nct_id)
+        if trial is None:
+            return None
+        return {
+            **trial,
+            "notes": [
+                {**note, "timestamp": _format_timestamp(note["timestamp"])}
+                for note in trial["notes"].values()
+            ],
+            "tags": sorted(trial["tags"])
+        }
 
     def star_trial(self, nct_id: str, starred: bool = True):
         """Star/favorite a trial.
@@ -80,18 +362,15 @@ class TrialNotesManager:
             nct_id: NCT ID of trial
             starred: True to star, False to unstar
         """
-        if nct_id not in self.notes:
-            self.notes[nct_id] = {
-                "nct_id": nct_id,
-                "notes": [],
-                "starred": starred,
-                "flagged": False,
-                "tags": []
-            }
-        else:
-            self.notes[nct_id]["starred"] = starred
+        nct_id = sys.intern(nct_id)
+        with self._lock:
+            self._get_or_create_trial(nct_id)["starred"] = starred
 
-        self._save_notes()
+            if starred:
+                self._starred.add(nct_id)
+            else:
+                self._starred.discard(nct_id)
+            self._mark_dirty()
 
     def flag_trial(self, nct_id: str, flagged: bool = True):
         """Flag a trial for concern/review.
@@ -100,18 +379,15 @@ class TrialNotesManager:
             nct_id: NCT ID of trial
             flagged: True to flag, False to unflag
         """
-        if nct_id not in self.notes:
-            self.notes[nct_id] = {
-                "nct_id": nct_id,
-                "notes": [],
-                "starred": False,
-                "flagged": flagged,
-                "tags": []
-            }
-        else:
-            self.notes[nct_id]["flagged"] = flagged
+        nct_id = sys.intern(nct_id)
+        with self._lock:
+            self._get_or_create_trial(nct_id)["flagged"] = flagged
 
-        self._save_notes()
+            if flagged:
+                self._flagged.add(nct_id)
+            else:
+                self._flagged.discard(nct_id)
+            self._mark_dirty()
 
     def add_tags(self, nct_id: str, tags: List[str]):
         """Add tags to a trial.
@@ -120,21 +396,14 @@ class TrialNotesManager:
             nct_id: NCT ID of trial
             tags: List of tags to add
         """
-        if nct_id not in self.notes:
-            self.notes[nct_id] = {
-                "nct_id": nct_id,
-                "notes": [],
-                "starred": False,
-                "flagged": False,
-                "tags": tags
-            }
-        else:
+        nct_id = sys.intern(nct_id)
+        with self._lock:
             # Merge tags without duplicates
-            existing_tags = set(self.notes[nct_id].get("tags", []))
-            new_tags = existing_tags.union(set(tags))
-            self.notes[nct_id]["tags"] = list(new_tags)
+            self._get_or_create_trial(nct_id)["tags"].update(tags)
 
-        self._save_notes()
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(nct_id)
+            self._mark_dirty()
 
     def get_starred_trials(self) -> List[str]:
         """Get list of starred trial NCT IDs.
@@ -142,7 +411,7 @@ class TrialNotesManager:
         Returns:
             List of NCT IDs
         """
-        return [nct_id for nct_id, data in self.notes.items() if data.get("starred", False)]
+        return self._in_notes_order(self._starred)
 
     def get_flagged_trials(self) -> List[str]:
         """Get list of flagged trial NCT IDs.
@@ -150,7 +419,7 @@ class TrialNotesManager:
         Returns:
             List of NCT IDs
         """
-        return [nct_id for nct_id, data in self.notes.items() if data.get("flagged", False)]
+        return self._in_notes_order(self._flagged)
 
     def get_trials_by_tag(self, tag: str) -> List[str]:
         """Get trials with a specific tag.
@@ -161,7 +430,7 @@ class TrialNotesManager:
         Returns:
             List of NCT IDs
         """
-        return [nct_id for nct_id, data in self.notes.items() if tag in data.get("tags", [])]
+        return self._in_notes_order(self._tag_index.get(tag, ()))
 
     def delete_note(self, nct_id: str, note_id: str) -> bool:
         """Delete a specific note.
@@ -173,12 +442,10 @@ class TrialNotesManager:
         Returns:
             True if deleted, False if not found
         """
-        if nct_id in self.notes:
-            notes_list = self.notes[nct_id]["notes"]
-            for i, note in enumerate(notes_list):
-                if note["note_id"] == note_id:
-                    notes_list.pop(i)
-                    self._save_notes()
-                    return True
+        with self._lock:
+            trial = self.notes.get(nct_id)
+            if trial is None or trial["notes"].pop(note_id, None) is None:
+                return False
 
-        return False
+            self._mark_dirty()
+            return True
@@ -5,6 +5,54 @@ import re
 from typing import Optional, Any
 import pandas as pd
 
+_STATE_ERROR = "Please enter a valid US state (e.g., CA or California)"
+
+_STATE_ABBREVIATIONS = frozenset({
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
+    "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+    "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+    "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+    "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY", "DC"
+})
+
+_STATE_NAMES = frozenset({
+    "ALABAMA", "ALASKA", "ARIZONA", "ARKANSAS", "CALIFORNIA", "COLORADO",
+    "CONNECTICUT", "DELAWARE", "FLORIDA", "GEORGIA", "HAWAII", "IDAHO",
+    "ILLINOIS", "INDIANA", "IOWA", "KANSAS", "KENTUCKY", "LOUISIANA", "MAINE",
+    "MARYLAND", "MASSACHUSETTS", "MICHIGAN", "MINNESOTA", "MISSISSIPPI",
+    "MISSOURI", "MONTANA", "NEBRASKA", "NEVADA", "NEW HAMPSHIRE", "NEW JERSEY",
+    "NEW MEXICO", "NEW YORK", "NORTH CAROLINA", "NORTH DAKOTA", "OHIO",
+    "OKLAHOMA", "OREGON", "PENNSYLVANIA", "RHODE ISLAND", "SOUTH CAROLINA",
+    "SOUTH DAKOTA", "TENNESSEE", "TEXAS", "UTAH", "VERMONT", "VIRGINIA",
+    "WASHINGTON", "WEST VIRGINIA", "WISCONSIN", "WYOMING"
+})
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Keywords only match as whole words, so removing them all in one pass
+# leaves the same text as removing them one at a time
+_SQL_KEYWORD_RE = re.compile(
+    r'\b(?:DROP|DELETE|INSERT|UPDATE|SELECT|UNION)\b', re.IGNORECASE
+)
+
+# Longest keyword plus the character after it checked by \b
+_KEYWORD_REACH = 7
+
+# Characters past max_length cleaned for long inputs, so removed tags and
+# keywords usually still leave max_length characters
+_PREFIX_SLACK = 64
+
+_DISALLOWED_CHAR_RE = re.compile(r'[^\w\s\-.,;:()\'"]')
+
+# NCT followed by 8 digits
+_NCT_ID_RE = re.compile(r'^NCT\d{8}$')
+
+_COMMON_CANCERS = (
+    "lung", "breast", "prostate", "colon", "melanoma", "lymphoma",
+    "leukemia", "pancreatic", "brain", "liver", "kidney", "bladder",
+    "ovarian", "cervical", "thyroid", "myeloma", "sarcoma", "glioblastoma"
+)
+
 
 def validate_age(age: Any) -> tuple[bool, str]:
     """Validate patient age input."""
@@ -20,45 +68,44 @@ def validate_age(age: Any) -> tuple[bool, str]:
 def validate_state(state: str) -> tuple[bool, str]:
     """Validate US state input."""
     if state is None:
-        return False, "Please enter a valid US state (e.g., CA or California)"
+        return False, _STATE_ERROR
     if not state:
         return True, ""  # Empty string is optional
 
-    valid_states = {
-        "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
-        "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
-        "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
-        "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
-        "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY", "DC"
-    }
-
     state_upper = state.upper().strip()
-    if len(state_upper) == 2 and state_upper in valid_states:
+    if state_upper in _STATE_ABBREVIATIONS or state_upper in _STATE_NAMES:
         return True, ""
 
-    # Check full state names
-    state_names = {
-        "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR",
-        "CALIFORNIA": "CA", "COLORADO": "CO", "CONNECTICUT": "CT",
-        "DELAWARE": "DE", "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI",
-        "IDAHO": "ID", "ILLINOIS": "IL", "INDIANA": "IN", "IOWA": "IA",
-        "KANSAS": "KS", "KENTUCKY": "KY", "LOUISIANA": "LA", "MAINE": "ME",
-        "MARYLAND": "MD", "MASSACHUSETTS": "MA", "MICHIGAN": "MI",
-        "MINNESOTA": "MN", "MISSISSIPPI": "MS", "MISSOURI": "MO",
-        "MONTANA": "MT", "NEBRASKA": "NE", "NEVADA": "NV",
-        "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM",
-        "NEW YORK": "NY", "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND",
-        "OHIO": "OH", "OKLAHOMA": "OK", "OREGON": "OR", "PENNSYLVANIA": "PA",
-        "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC", "SOUTH DAKOTA": "SD",
-        "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT",
-        "VIRGINIA": "VA", "WASHINGTON": "WA", "WEST VIRGINIA": "WV",
-        "WISCONSIN": "WI", "WYOMING": "WY"
-    }
-
-    if state_upper in state_names:
-        return True, ""
+    return False, _STATE_ERROR
+
+
+def _remove_markup(text: str, max_length: int) -> str:
+    """Remove HTML tags, then SQL keywords.
 
-    return False, "Please enter a valid US state (e.g., CA or California)"
+    Long inputs are first cleaned from a prefix slightly over max_length
+    characters. When no tag is left open at the end of the prefix and
+    enough text survives, its first max_length characters are the same as
+    cleaning the whole input, so the rest is never scanned.
+
+    Args:
+        text: Text to clean
+        max_length: Number of leading characters of the result that must
+            match cleaning the whole text
+
+    Returns:
+        Cleaned text, possibly cut short after its first max_length characters
+    """
+    if 0 <= max_length and len(text) > max_length + _PREFIX_SLACK:
+        head = text[:max_length + _PREFIX_SLACK]
+        # An unclosed tag could run on past the prefix
+        if head.rfind('<') <= head.rfind('>'):
+            head = _SQL_KEYWORD_RE.sub('', _HTML_TAG_RE.sub('', head))
+            # A keyword near the end could match differently with the rest
+            # of the text after it, so only trust what comes before
+            if len(head) >= max_length + _KEYWORD_REACH:
+                return head
+
+    return _SQL_KEYWORD_RE.sub('', _HTML_TAG_RE.sub('', text))
 
 
 def sanitize_text_input(text: str, max_length: int = 500) -> str:
@@ -66,19 +113,14 @@ def sanitize_text_input(text: str, max_length: int = 500) -> str:
     if not text:
         return ""
 
-    # Remove any HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-
-    # Remove any SQL keywords
-    sql_keywords = ["DROP", "DELETE", "INSERT", "UPDATE", "SELECT", "UNION"]
-    for keyword in sql_keywords:
-        text = re.sub(rf'\b{keyword}\b', '', text, flags=re.IGNORECASE)
+    # Remove any HTML tags and SQL keywords
+    text = _remove_markup(text, max_length)
 
     # Limit length
     text = text[:max_length]
 
     # Basic character whitelist
-    text = re.sub(r'[^\w\s\-.,;:()\'"]', '', text)
+    text = _DISALLOWED_CHAR_RE.sub('', text)
 
     return text.strip()
 
@@ -94,15 +136,9 @@ def validate_cancer_type(cancer_type: str) -> tuple[bool, str]:
     if len(cancer_type_clean) < 3:
         return False, "Cancer type must be at least 3 characters"
 
-    # Check for common patterns
-    common_cancers = [
-        "lung", "breast", "prostate", "colon", "melanoma", "lymphoma",
-        "leukemia", "pancreatic", "brain", "liver", "kidney", "bladder",
-        "ovarian", "cervical", "thyroid", "myeloma", "sarcoma", "glioblastoma"
-    ]
-
     # Just warn if not a common type, don't reject
-    found_common = any(cancer in cancer_type_clean.lower() for cancer in common_cancers)
+    cancer_type_lower = cancer_type_clean.lower()
+    found_common = any(cancer in cancer_type_lower for cancer in _COMMON_CANCERS)
     if not found_common:
         return True, ""  # Still valid, just uncommon
 
@@ -117,9 +153,7 @@ def validate_nct_id(nct_id: str) -> tuple[bool, str]:
     # Clean the input
     nct_id = nct_id.strip().upper()
 
-    # Check format: NCT followed by 8 digits
-    pattern = r'^NCT\d{8}$'
-    if not re.match(pattern, nct_id):
+    if not _NCT_ID_RE.match(nct_id):
         return False, "NCT ID must be in format NCT12345678 (NCT followed by 8 digits)"
 
     return True, ""